@@ -1,15 +1,9 @@
 import streamlit as st
-from dotenv import load_dotenv
-import os
-from backend.database import get_db
+from backend.database import session_scope
 from backend.models.pool import Pool
+from backend.models.generation import LeagueGeneration
+from backend.page_cache import page_cache, shared_result
 
-db = next(get_db())
-
-
-# Load environment variables
-load_dotenv()
-postgresql = os.environ.get("postgresql")
 
 # set basic page config
 st.set_page_config(page_title="Commish",
@@ -20,20 +14,25 @@ st.set_page_config(page_title="Commish",
 with open('assets/css/style.css') as css:
     st.markdown(f'<style>{css.read()}</style>', unsafe_allow_html=True)
 
-@st.cache_data(ttl=3600)
-def get_pools():
-    pools = (
-        db.query(Pool)
-        .distinct(Pool.label, Pool.pool_type)
-        .order_by(Pool.pool_type)
-        .all()
-    )
+def query_pools():
+    with session_scope() as db:
+        pools = (
+            db.query(Pool)
+            .distinct(Pool.label, Pool.pool_type)
+            .order_by(Pool.pool_type)
+            .all()
+        )
     return pools
 
+
+@page_cache
+def get_pools(generation):
+    return shared_result(("commish_pools",), generation, query_pools)
+
 def main():
     st.title("Defending Champion")
     st.header("Christian Wagner")
-    pools = get_pools()
+    pools = get_pools(LeagueGeneration.current())
     for pool in pools:
         st.columns(3)
         st.metric(pool.label, float(pool.payout_amount))
@@ -0,0 +1,370 @@
+"""
+Frames Module
+=============
+
+The Frames module provides a columnar representation of a league's data and vectorized stats.
+
+`LeagueFrames` holds the matchups, head-to-head results, player scores and team stats of a league
+as pandas DataFrames with typed columns and precomputed opt-out eligibility masks. It is built once
+per sync. The `Frame*Stats` classes mirror every `MatchupStats`, `PlayerStats` and `LeagueStats`
+method with the same arguments and identical outputs, including tie order, but run as vectorized
+operations over the frames. They are meant for multi-season and multi-league history analyses,
+where the dict-based path is too slow.
+
+Functions:
+    derive_head_to_head: Derives every week's head-to-head results from matchups in one batch.
+
+Classes:
+    LeagueFrames: Columnar tables of a league's matchups and derived stats.
+    FrameMatchupStats: Vectorized equivalent of MatchupStats.
+    FramePlayerStats: Vectorized equivalent of PlayerStats.
+    FrameLeagueStats: Vectorized equivalent of LeagueStats.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+MATCHUP_COLUMNS = {
+    "week": "int64",
+    "matchup_id": "Int64",
+    "roster_id": "int64",
+    "points": "float64",
+}
+HEAD_TO_HEAD_COLUMNS = {
+    "week": "int64",
+    "matchup_id": "Int64",
+    "matchup_winner": "int64",
+    "matchup_loser": "int64",
+    "winner_points": "float64",
+    "loser_points": "float64",
+    "matchup_margin": "float64",
+    "tie": "bool",
+}
+PLAYER_COLUMNS = {
+    "player_id": "object",
+    "week": "int64",
+    "score": "float64",
+    "roster_id": "int64",
+    "position": "object",
+    "player_name": "object",
+}
+TEAM_COLUMNS = {
+    "roster_id": "int64",
+    "total_wins": "int64",
+    "total_losses": "int64",
+    "total_ties": "int64",
+    "total_points_for": "float64",
+    "total_points_against": "float64",
+}
+
+
+def _frame(rows, columns):
+    """
+    Builds a typed DataFrame from a list of row dictionaries.
+
+    Args:
+        rows (iterable): The rows to convert.
+        columns (dict): A mapping of column name to dtype.
+
+    Returns:
+        pd.DataFrame: The typed frame, with one row per input row in input order.
+    """
+    frame = pd.DataFrame.from_records(list(rows), columns=list(columns))
+    # Flags missing from older rows default to False rather than a truthy NaN.
+    flags = {column: False for column, dtype in columns.items() if dtype == "bool"}
+    return frame.fillna(flags).astype(columns)
+
+
+def _records(frame):
+    """
+    Converts a frame to a list of row dictionaries with native Python values and None for nulls.
+
+    Args:
+        frame (pd.DataFrame): The frame to convert.
+
+    Returns:
+        list: The rows as dictionaries.
+    """
+    frame = frame.astype(object)
+    return frame.where(frame.notna(), None).to_dict("records")
+
+
+def _top(frame, column, top_n, ascending=False):
+    """
+    Selects the top N rows by a column, keeping input order among ties.
+
+    Args:
+        frame (pd.DataFrame): The rows to rank.
+        column (str or list): The column(s) to rank by.
+        top_n (int): The number of rows to return.
+        ascending (bool): Whether the lowest values rank first. Default is False.
+
+    Returns:
+        pd.DataFrame: The top N rows in rank order.
+    """
+    return frame.sort_values(column, ascending=ascending, kind="stable").head(top_n)
+
+
+def derive_head_to_head(matchups):
+    """
+    Derives the head-to-head results of every week in one batch.
+
+    Matchups are paired on (week, matchup_id). Teams without a matchup_id (byes and teams out
+    of the playoffs) and matchup_ids without exactly two teams are left out. In a tie the team
+    listed first is recorded as the winner with a margin of 0 and `tie` set to True.
+
+    Args:
+        matchups (iterable): The matchup rows, each with week, matchup_id, roster_id and points.
+
+    Returns:
+        list: The head-to-head rows in week order, then first-appearance order of matchup_id.
+    """
+    frame = _frame(matchups, MATCHUP_COLUMNS).dropna(subset=["matchup_id"])
+    groups = frame.groupby(["week", "matchup_id"], sort=False)
+    frame = frame[groups["roster_id"].transform("size").to_numpy() == 2]
+    slot = frame.groupby(["week", "matchup_id"], sort=False).cumcount().to_numpy()
+    first = frame[slot == 0].set_index(["week", "matchup_id"])
+    second = frame[slot == 1].set_index(["week", "matchup_id"]).reindex(first.index)
+
+    first_wins = (first["points"] >= second["points"]).to_numpy()
+    winner_points = np.where(first_wins, first["points"], second["points"])
+    loser_points = np.where(first_wins, second["points"], first["points"])
+    head_to_head = pd.DataFrame(
+        {
+            "week": first.index.get_level_values("week"),
+            "matchup_id": first.index.get_level_values("matchup_id"),
+            "matchup_winner": np.where(first_wins, first["roster_id"], second["roster_id"]),
+            "matchup_loser": np.where(first_wins, second["roster_id"], first["roster_id"]),
+            "winner_points": winner_points,
+            "loser_points": loser_points,
+            "matchup_margin": winner_points - loser_points,
+            "tie": winner_points == loser_points,
+        }
+    )
+    return _records(head_to_head.sort_values("week", kind="stable"))
+
+
+class LeagueFrames:
+    """
+    Columnar tables of a league's matchups and derived stats.
+
+    Attributes:
+        matchups (pd.DataFrame): One row per team per week.
+        head_to_head (pd.DataFrame): One row per decided matchup per week.
+        player_stats (pd.DataFrame): One row per starter per week.
+        team_stats (pd.DataFrame): One row per roster.
+        regular_season (list): The weeks of the regular season.
+    """
+
+    def __init__(self, matchups, head_to_head, player_stats, team_stats, optout_ids, regular_season):
+        """
+        Initializes LeagueFrames and precomputes the opt-out eligibility masks.
+
+        Args:
+            matchups (pd.DataFrame): The matchups frame.
+            head_to_head (pd.DataFrame): The head-to-head frame.
+            player_stats (pd.DataFrame): The player scores frame.
+            team_stats (pd.DataFrame): The team stats frame.
+            optout_ids (frozenset): The opted-out roster IDs.
+            regular_season (list): The weeks of the regular season.
+        """
+        optouts = list(optout_ids)
+        self.matchups = matchups.assign(eligible=~matchups["roster_id"].isin(optouts))
+        self.head_to_head = head_to_head.assign(
+            winner_eligible=~head_to_head["matchup_winner"].isin(optouts),
+            loser_eligible=~head_to_head["matchup_loser"].isin(optouts),
+        )
+        self.player_stats = player_stats.assign(
+            eligible=~player_stats["roster_id"].isin(optouts)
+        )
+        self.team_stats = team_stats.assign(eligible=~team_stats["roster_id"].isin(optouts))
+        self.regular_season = list(regular_season)
+
+    @classmethod
+    def from_league(cls, league):
+        """
+        Builds the frames from a league's fetched data.
+
+        Args:
+            league (League): The League instance, with its stats fetched.
+
+        Returns:
+            LeagueFrames: The columnar tables of the league.
+        """
+        return cls(
+            _frame(league.matchups, MATCHUP_COLUMNS),
+            _frame(league.head_to_head, HEAD_TO_HEAD_COLUMNS),
+            _frame(league.player_stats, PLAYER_COLUMNS),
+            _frame(getattr(league, "team_stats", []), TEAM_COLUMNS),
+            league.optout_ids,
+            league.REGULAR_SEASON,
+        )
+
+    def week_rows(self, frame, week=None):
+        """
+        Selects the rows of a frame for a week, or every row if week is None.
+
+        Args:
+            frame (pd.DataFrame): The frame to filter.
+            week (int): The week number to filter by. If None, every row is returned.
+
+        Returns:
+            pd.DataFrame: The matching rows.
+        """
+        if week is None:
+            return frame
+        return frame[frame["week"].to_numpy() == week]
+
+
+class FrameMatchupStats:
+    """
+    Vectorized equivalent of MatchupStats, reading `league.frames`.
+    """
+
+    def get_small_scoring_margin(league, week=None, top_n=1):
+        frames = league.frames
+        rows = frames.week_rows(frames.head_to_head, week)
+        rows = rows[rows["loser_eligible"].to_numpy() & ~rows["tie"].to_numpy()]
+        top = _top(rows, "matchup_margin", top_n, ascending=True)
+        return _records(
+            pd.DataFrame(
+                {
+                    "week": top["week"],
+                    "matchup_id": top["matchup_id"],
+                    "roster_id": top["matchup_loser"],
+                    "score": top["matchup_margin"],
+                    "opponent_id": top["matchup_winner"],
+                }
+            )
+        )
+
+    def get_high_scoring_margin(league, week=None, top_n=1):
+        frames = league.frames
+        rows = frames.week_rows(frames.head_to_head, week)
+        rows = rows[rows["winner_eligible"].to_numpy() & ~rows["tie"].to_numpy()]
+        top = _top(rows, "matchup_margin", top_n)
+        return _records(
+            pd.DataFrame(
+                {
+                    "week": top["week"],
+                    "matchup_id": top["matchup_id"],
+                    "roster_id": top["matchup_winner"],
+                    "score": top["matchup_margin"],
+                    "opponent_id": top["matchup_loser"],
+                }
+            )
+        )
+
+    def get_high_team_score(league, week=None, top_n=1):
+        frames = league.frames
+        rows = frames.week_rows(frames.matchups, week)
+        top = _top(rows[rows["eligible"]], "points", top_n)
+        return _records(
+            pd.DataFrame(
+                {
+                    "week": top["week"],
+                    "matchup_id": top["matchup_id"],
+                    "roster_id": top["roster_id"],
+                    "score": top["points"],
+                    "opponent_id": "",
+                }
+            )
+        )
+
+    def get_high_score_against(league, week=None, top_n=1):
+        frames = league.frames
+        rows = frames.week_rows(frames.head_to_head, week)
+        rows = rows[rows["loser_eligible"].to_numpy() & ~rows["tie"].to_numpy()]
+        top = _top(rows, "winner_points", top_n)
+        return _records(
+            pd.DataFrame(
+                {
+                    "week": top["week"],
+                    "matchup_id": top["matchup_id"],
+                    "roster_id": top["matchup_loser"],
+                    "score": top["winner_points"],
+                    "opponent_id": top["matchup_winner"],
+                }
+            )
+        )
+
+    def get_head_to_head_winners(league, week=None, matchup_id=None):
+        frames = league.frames
+        rows = frames.week_rows(frames.head_to_head, week)
+        mask = rows["winner_eligible"].to_numpy() & ~rows["tie"].to_numpy()
+        if matchup_id is not None:
+            mask = mask & (rows["matchup_id"] == matchup_id).fillna(False).to_numpy()
+        rows = rows[mask]
+        return _records(
+            pd.DataFrame(
+                {
+                    "week": rows["week"],
+                    "matchup_id": rows["matchup_id"],
+                    "roster_id": rows["matchup_winner"],
+                    "opponent_id": rows["matchup_loser"],
+                }
+            )
+        )
+
+
+class FramePlayerStats:
+    """
+    Vectorized equivalent of PlayerStats, reading `league.frames`.
+    """
+
+    def get_high_player_score(league, week=None, top_n=1):
+        frames = league.frames
+        rows = frames.player_stats
+        if week is None:
+            rows = rows[rows["week"].isin(frames.regular_season)]
+        else:
+            rows = frames.week_rows(rows, week)
+        top = _top(rows[rows["eligible"]], "score", top_n)
+        return _records(top[list(PLAYER_COLUMNS)])
+
+    def get_regular_season_high_scoring_player(league, top_n=1):
+        rows = league.frames.player_stats
+        rows = rows[rows["eligible"]]
+        codes, player_ids = pd.factorize(rows["player_id"], sort=False)
+        # Accumulate in row order so totals match a sequential Python sum exactly.
+        totals = np.zeros(len(player_ids))
+        np.add.at(totals, codes, rows["score"].to_numpy())
+        first = rows.drop_duplicates("player_id")
+        players = pd.DataFrame(
+            {
+                "player_id": first["player_id"].to_numpy(),
+                "score": totals,
+                "roster_id": first["roster_id"].to_numpy(),
+                "position": first["position"].to_numpy(),
+                "player_name": first["player_name"].to_numpy(),
+            }
+        )
+        return _records(_top(players, "score", top_n))
+
+
+class FrameLeagueStats:
+    """
+    Vectorized equivalent of LeagueStats, reading `league.frames`.
+    """
+
+    def get_regular_season_first_place(league, top_n=1):
+        rows = league.frames.team_stats
+        top = _top(rows[rows["eligible"]], ["total_wins", "total_points_for"], top_n)
+        return _records(top[list(TEAM_COLUMNS)])
+
+    def get_regular_season_most_points(league, top_n=1):
+        rows = league.frames.team_stats
+        top = _top(rows[rows["eligible"]], "total_points_for", top_n)
+        return _records(
+            pd.DataFrame({"roster_id": top["roster_id"], "score": top["total_points_for"]})
+        )
+
+    def get_regular_season_most_points_against(league, top_n=1):
+        rows = league.frames.team_stats
+        top = _top(rows[rows["eligible"]], "total_points_against", top_n)
+        return _records(
+            pd.DataFrame(
+                {"roster_id": top["roster_id"], "score": top["total_points_against"]}
+            )
+        )
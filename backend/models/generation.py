@@ -0,0 +1,74 @@
+"""
+Generation Module
+=================
+
+The Generation module tracks a per-league data version for cache invalidation.
+
+Every write path that changes a league's pools, users, rosters or leaderboards bumps the league's
+generation in the same transaction as the write. Page caches include the generation in their
+keys, so cached results are reused until the data actually changes and are recomputed on the
+first view after it does. The table is created on first use, so existing databases need no
+migration.
+
+Classes:
+    LeagueGeneration: The data generation of a league.
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, String, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.declarative import declarative_base
+
+from ..database import ensure_table, session_scope
+
+Base = declarative_base()
+
+
+class LeagueGeneration(Base):
+    """
+    The data generation of a league, incremented by every write to the league's data.
+    """
+
+    __tablename__ = "league_generations"
+
+    league_id = Column(String, primary_key=True)
+    generation = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True))
+
+    @classmethod
+    def bump(cls, db, league_id):
+        """
+        Increments the generation of a league within the caller's transaction.
+
+        Args:
+            db (Session): The session running the write.
+            league_id (str): The ID of the league whose data changed.
+        """
+        ensure_table(cls.__table__)
+        stmt = insert(cls).values(league_id=league_id, generation=1, updated_at=func.now())
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["league_id"],
+            set_={"generation": cls.generation + 1, "updated_at": func.now()},
+        )
+        db.execute(stmt)
+
+    @classmethod
+    def current(cls, league_id=None):
+        """
+        Gets the generation of a league, or of all leagues together.
+
+        Since generations only increase, the sum over all leagues changes whenever any league
+        changes, which makes it a valid version for results that span leagues.
+
+        Args:
+            league_id (str): The ID of the league. If None, the combined generation is returned.
+
+        Returns:
+            int: The generation, or 0 if nothing has been written yet.
+        """
+        if league_id is None:
+            query = select(func.coalesce(func.sum(cls.generation), 0))
+        else:
+            query = select(cls.generation).where(cls.league_id == league_id)
+        ensure_table(cls.__table__)
+        with session_scope() as db:
+            return int(db.execute(query).scalar() or 0)
@@ -0,0 +1,43 @@
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from ..models.pool import Pool
+from ..models.user import User
+
+from ..database import async_session_scope, session_scope
+
+
+SEASON_SUBTYPES = ["season", "season_cumulative", "season_high"]
+
+
+def _season_pools_query():
+    return (
+        select(Pool)
+        .distinct(Pool.label, Pool.pool_type)
+        .where(Pool.pool_subtype.in_(SEASON_SUBTYPES))
+        .order_by(Pool.pool_type)
+    )
+
+
+def _users_query():
+    # Rosters are loaded up front, since User.to_dict reads them after the session closes.
+    return select(User).options(selectinload(User.rosters))
+
+
+def get_season_pools():
+    with session_scope() as db:
+        return list(db.execute(_season_pools_query()).scalars())
+
+
+async def get_season_pools_async():
+    async with async_session_scope() as db:
+        return list((await db.execute(_season_pools_query())).scalars())
+
+
+def get_users():
+    with session_scope() as db:
+        return list(db.execute(_users_query()).scalars())
+
+
+async def get_users_async():
+    async with async_session_scope() as db:
+        return list((await db.execute(_users_query())).scalars())
@@ -10,14 +10,20 @@ Classes:
     League: A class for managing league information and calculations.
 """
 
-from sleeperpy import Leagues, Players
+from concurrent.futures import ThreadPoolExecutor
 import yaml
-import pandas as pd
 
-from sqlalchemy.orm import relationship
-from sqlalchemy import Column, String, Integer, Float, ARRAY
+from sqlalchemy.orm import relationship, synonym
+from sqlalchemy import Column, String, Integer, Float, ARRAY, update
+from sqlalchemy import inspect as sqlalchemy_inspect
 from sqlalchemy.ext.declarative import declarative_base
-from ..database import db
+from ..database import session_scope
+from .sleeper_cache import SleeperCache, RosterCache
+from .players import PlayerDirectory
+from .week_index import WeekIndex
+from .frames import derive_head_to_head
+from .season_aggregator import SeasonAggregator
+from .generation import LeagueGeneration
 
 Base = declarative_base()
 
@@ -30,10 +36,10 @@ class League(Base):
 
     __tablename__ = 'leagues'
 
-    season = Column(Integer)
-    week = Column(Integer)
-    sleeper_user_id = Column(String)
-    league_id = Column(String, primary_key=True)
+    _season = Column("season", Integer)
+    _week = Column("week", Integer)
+    _sleeper_user_id = Column("sleeper_user_id", String)
+    _league_id = Column("league_id", String, primary_key=True)
     main_buy_in = Column(Float)
     side_buy_in = Column(Float)
     team_count = Column(Integer)
@@ -49,31 +55,238 @@ class League(Base):
     LAST_WEEK = REGULAR_SEASON[-1]
     PLAYOFFS = list(range(15, 18))
     CHAMPIONSHIP_WEEK = PLAYOFFS[-1]
+    # (round, match) of the championship and third place games in the winners bracket.
+    CHAMPIONSHIP_MATCH = (3, 6)
+    THIRD_PLACE_MATCH = (3, 7)
+
+    FETCH_CONCURRENCY = 8
+
+    _requested_season = None
+    _state = None
+    _config = None
+    _optout_ids = None
+    _frames = None
+    _season_aggregate = None
+    _playoff_index = None
 
     def __init__(self, season=None):
-        if season is None:
-            self.season = self._set_season()
-            self.week = self._set_week()
-        else:
-            self.season = season
-            self.week = 17
-        self.config = self._load_config()
-        self.sleeper_user_id = self.config["credentials"]["sleeper_user_id"]
-        self.league_id = self._set_league_id()
-        self.state = Leagues.get_state("nfl")
-        
-        if db:
-            self.db = db
+        """
+        Initializes a League without any network or database work.
 
-        existing_league = self.query.filter_by(league_id=self.league_id).first()
-        if existing_league:
-            self.load_league(existing_league)
-        else:
+        The NFL state, config, season, week, Sleeper user ID and league ID are resolved the first
+        time they are read. Call `setup()` to store a new league with its pools and `sync()` to
+        fetch its stats.
+
+        Args:
+            season (int): The season of the league. If None, the active season on Sleeper is used.
+        """
+        self._requested_season = season
+
+    @property
+    def state(self):
+        """
+        The current NFL state on Sleeper, fetched on first access.
+        """
+        if self._state is None:
+            self._state = SleeperCache.get_state("nfl")
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        self._state = value
+
+    @property
+    def config(self):
+        """
+        The configuration of the league's season, loaded on first access.
+        """
+        if self._config is None:
+            self._config = self._load_config()
+        return self._config
+
+    @config.setter
+    def config(self, value):
+        self._config = value
+
+    def _get_season(self):
+        """
+        The league's season, defaulting to the active season on Sleeper.
+        """
+        if self._season is None:
+            if self._requested_season is None:
+                self._season = self._set_season()
+            else:
+                self._season = self._requested_season
+        return self._season
+
+    def _set_season_value(self, value):
+        self._season = value
+
+    def _get_week(self):
+        """
+        The league's current week, derived from the NFL state for the active season.
+        """
+        if self._week is None:
+            self._week = 17 if self._requested_season is not None else self._set_week()
+        return self._week
+
+    def _set_week_value(self, value):
+        self._week = value
+
+    def _get_sleeper_user_id(self):
+        """
+        The commissioner's Sleeper user ID from the config.
+        """
+        if self._sleeper_user_id is None:
+            self._sleeper_user_id = self.config["credentials"]["sleeper_user_id"]
+        return self._sleeper_user_id
+
+    def _set_sleeper_user_id_value(self, value):
+        self._sleeper_user_id = value
+
+    def _get_league_id(self):
+        """
+        The league's Sleeper ID, looked up from the commissioner's leagues.
+        """
+        if self._league_id is None:
+            self._league_id = self._set_league_id()
+        return self._league_id
+
+    def _set_league_id_value(self, value):
+        self._league_id = value
+
+    # Column-backed attributes resolved from Sleeper and the config on first access.
+    season = synonym("_season", descriptor=property(_get_season, _set_season_value))
+    week = synonym("_week", descriptor=property(_get_week, _set_week_value))
+    sleeper_user_id = synonym(
+        "_sleeper_user_id",
+        descriptor=property(_get_sleeper_user_id, _set_sleeper_user_id_value),
+    )
+    league_id = synonym("_league_id", descriptor=property(_get_league_id, _set_league_id_value))
+
+    def setup(self):
+        """
+        Stores a new league with its pools. If the league is already stored, its stored row is
+        copied onto this instance instead.
+
+        Returns:
+            bool: True if the league was created, False if it was already stored.
+        """
+        with session_scope() as db:
+            stored = db.get(League, self.league_id)
+        if stored is not None:
+            self._restore(stored)
+            return False
+        with RosterCache.sync_run():
+            # The lazy columns are only resolved on access, so resolve them before the insert.
+            self._resolve_columns()
             self.create_new_league()
-            self.db.add(self)
-            self.db.commit()
+            with session_scope() as db:
+                db.add(self)
+                LeagueGeneration.bump(db, self.league_id)
             self.setup_pools()
-            self.fetch_stats()
+        return True
+
+    def sync(self, incremental=True):
+        """
+        Fetches the league's matchups, derives its stats and refreshes its leaderboard snapshots.
+
+        The league is set up first, which stores it if it is new and restores its stored row
+        otherwise. In the active season the week is moved forward to the NFL state's and stored.
+        Rosters are shared across the run.
+
+        Args:
+            incremental (bool): Whether to only sync weeks newer than the last sync (default: True).
+        """
+        from .snapshot import refresh_leaderboard_snapshots
+        self.setup()
+        self.state = SleeperCache.get_state("nfl")
+        if int(self.season) == int(self.state["season"]):
+            self._advance_week(self._set_week())
+        with RosterCache.sync_run():
+            self.fetch_stats(incremental=incremental)
+        refresh_leaderboard_snapshots(self)
+
+    def _resolve_columns(self):
+        """
+        Resolves the season, week and Sleeper user ID, which are otherwise resolved on first access.
+        """
+        self.season = self._get_season()
+        self.week = self._get_week()
+        self.sleeper_user_id = self._get_sleeper_user_id()
+
+    def _restore(self, stored):
+        """
+        Copies the columns of the league's stored row onto this instance.
+
+        Args:
+            stored (League): The stored league.
+        """
+        for attr in sqlalchemy_inspect(League).column_attrs:
+            setattr(self, attr.key, getattr(stored, attr.key))
+        self._build_optout_ids()
+
+    def _advance_week(self, week):
+        """
+        Stores a new current week for the league.
+
+        Args:
+            week (int): The current week.
+        """
+        if week == self._week:
+            return
+        self.week = week
+        leagues = League.__table__
+        with session_scope() as db:
+            db.execute(
+                update(leagues)
+                .where(leagues.c.league_id == self.league_id)
+                .values(week=week)
+            )
+            LeagueGeneration.bump(db, self.league_id)
+
+    @classmethod
+    def load(cls, league_id):
+        """
+        Loads a stored league with its stats without calling the Sleeper API.
+
+        The league row comes from the database, the config from its YAML file, the matchups and
+        derived stats from the state stored by the last sync, and the NFL state from the on-disk
+        Sleeper cache, even if that entry has expired. A league that has never been synced is
+        returned with empty stats. Use this for read paths such as page loads and batch jobs; use
+        `League().sync()` to sync with Sleeper.
+
+        Args:
+            league_id (str): The ID of the league.
+
+        Returns:
+            League: The hydrated league.
+
+        Raises:
+            ValueError: If the league is not in the database.
+        """
+        with session_scope() as db:
+            league = db.get(cls, league_id)
+        if league is None:
+            raise ValueError(f"League {league_id} not found.")
+        league.hydrate()
+        return league
+
+    def hydrate(self):
+        """
+        Restores the attributes of a stored league that are not kept in its database row.
+
+        Reads only local files. Without a cached NFL state, the league's own season is taken
+        to be the current one.
+        """
+        self.state = SleeperCache.load(("state", "nfl"), stale=True) or {
+            "season": str(self.season),
+            "week": int(self.week) + 1,
+            "season_type": "regular",
+        }
+        self.config = self._load_config()
+        self._build_optout_ids()
+        self._load_sync_state()
 
     def to_dict(self):
         return {
@@ -92,39 +305,139 @@ class League(Base):
 
 
 
-    def fetch_stats(self):
-        self.fetch_matchups()
-        self.get_head_to_head()
-        self.fetch_player_stats()
+    def fetch_stats(self, incremental=False):
+        """
+        Fetches matchups and derives head-to-head, player and team statistics for the league.
+
+        In incremental mode the weeks synced by a previous run are restored from the sync
+        store, and only the weeks after the last final synced week are fetched and derived.
+
+        Args:
+            incremental (bool): Whether to only sync weeks newer than the last sync (default: False).
+        """
+        self._build_optout_ids()
+        if not incremental:
+            self.fetch_matchups()
+            self.get_head_to_head()
+            self.fetch_player_stats()
+            self.fetch_team_stats()
+            self._save_sync_state()
+            return
+
+        synced_week = self._load_sync_state()
+        weeks = list(range(max(synced_week + 1, int(self.OPENING_WEEK)), int(self.week) + 1))
+        self.fetch_matchups(weeks=weeks)
+        self.get_head_to_head(weeks=weeks)
+        self.fetch_player_stats(weeks=weeks)
         self.fetch_team_stats()
+        self._save_sync_state()
+
+    @property
+    def optout_ids(self):
+        """
+        The roster IDs of opted-out teams as a frozenset of ints, built once per sync.
+
+        Returns:
+            frozenset: The opted-out roster IDs.
+        """
+        if self._optout_ids is None:
+            self._build_optout_ids()
+        return self._optout_ids
+
+    @property
+    def frames(self):
+        """
+        The columnar tables of the league's data, built once after each sync.
+
+        Returns:
+            LeagueFrames: The league's matchups, head-to-head results, player scores and team stats.
+        """
+        if self._frames is None:
+            from .frames import LeagueFrames
+            self._frames = LeagueFrames.from_league(self)
+        return self._frames
+
+    @property
+    def season_aggregate(self):
+        """
+        The leaderboards and winners of every season pool, computed in one pass after each sync.
+
+        A league loaded from the database without its stats is synced incrementally first.
+
+        Returns:
+            SeasonAggregator: The season pools' leaderboards and winners.
+        """
+        if self._season_aggregate is None:
+            if not hasattr(self, "head_to_head"):
+                self.fetch_stats(incremental=True)
+            self._season_aggregate = SeasonAggregator(self)
+        return self._season_aggregate
+
+    def _build_optout_ids(self):
+        """
+        Builds the opt-out mask from the stored optouts, which may be ints or strings.
+        """
+        self._optout_ids = frozenset(int(roster_id) for roster_id in self.optouts or [])
+        self._frames = None
+        self._season_aggregate = None
+
+    def _load_sync_state(self):
+        """
+        Restores the matchups and derived statistics persisted by the last sync.
+
+        Returns:
+            int: The last final week that was synced, or 0 if the league has never been synced.
+        """
+        state = SleeperCache.load_sync_state(self.league_id)
+        if state is None:
+            self.matchups, self.head_to_head, self.player_stats = (
+                WeekIndex(),
+                WeekIndex(),
+                WeekIndex(),
+            )
+            self.team_stats = []
+            return 0
+        self.matchups = WeekIndex(state["matchups"])
+        self.head_to_head = WeekIndex(state["head_to_head"])
+        self.player_stats = WeekIndex(state["player_stats"])
+        self.team_stats = state.get("team_stats", [])
+        self._frames = None
+        self._season_aggregate = None
+        return state["synced_week"]
+
+    def _save_sync_state(self):
+        """
+        Persists the matchups and derived statistics for the next incremental sync and for `load`.
+
+        Only final weeks are recorded as synced, so the in-progress week is fetched again next time.
+        """
+        synced_week = 0
+        for week in range(int(self.OPENING_WEEK), int(self.week) + 1):
+            if week not in self.matchups or not self._is_final(week):
+                break
+            synced_week = week
+        SleeperCache.store_sync_state(
+            self.league_id,
+            {
+                "synced_week": synced_week,
+                "matchups": self.matchups.to_dict(),
+                "head_to_head": self.head_to_head.to_dict(),
+                "player_stats": self.player_stats.to_dict(),
+                "team_stats": self.team_stats,
+            },
+        )
 
     def create_new_league(self):
         self.site = 'sleeper'
         self.main_buy_in = self.config["buy_ins"]["main_buy_in"]
         self.side_buy_in = self.config["buy_ins"]["side_buy_in"]
         self.optouts = self._get_optouts()
+        self._build_optout_ids()
         self.team_count = self._set_team_count()
         self.side_pool_count = self.team_count - len(self.optouts)
         self.main_pot = self.main_buy_in * self.team_count
         self.side_pot = self.side_buy_in * self.side_pool_count
         
-    def load_league(self):
-        """Fetches a league from the database with its associated pools.
-
-        Args:
-            session: A database session object.
-            league_id: The ID of the league to load.
-            season: The season to load the league for.
-
-        Returns:
-            The League object populated with data and its pools.
-        """
-
-        league = League.query.filter_by(season=self.season).first()
-        if league:
-            league.fetch_stats()
-        return league
-
     def _load_config(self):
         """
         Loads configuration from a YAML file for the given season.
@@ -155,6 +468,23 @@ class League(Base):
             self.state["week"] - 1 if self.state["season_type"] == "regular" else 1
         )
 
+    def _is_final(self, week=None):
+        """
+        Checks whether Sleeper data for the league, or one of its weeks, can no longer change.
+
+        Past seasons are always final. In the active season only weeks before the most recent
+        completed week are final, since the latest week can still receive stat corrections.
+
+        Args:
+            week (int): The week number to check. If None, checks season-wide data.
+
+        Returns:
+            bool: True if the data is final, False otherwise.
+        """
+        if int(self.season) < int(self.state["season"]):
+            return True
+        return week is not None and week < int(self.week)
+
     def _set_league_id(self):
         """
         Gets the ID of the league for the current user.
@@ -162,7 +492,9 @@ class League(Base):
         Returns:
             str: The ID of the league.
         """
-        leagues = Leagues.get_all_leagues(self.sleeper_user_id, "nfl", self.season)
+        leagues = SleeperCache.get_all_leagues(
+            self.sleeper_user_id, "nfl", self.season, final=self._is_final()
+        )
         if not leagues:
             raise ValueError("No leagues found for the given user and season.")
         return leagues[0]["league_id"]
@@ -174,7 +506,9 @@ class League(Base):
         Returns:
             int: The number of teams in the league.
         """
-        return Leagues.get_league(self.league_id)["total_rosters"]
+        return SleeperCache.get_league(self.league_id, final=self._is_final())[
+            "total_rosters"
+        ]
 
     def _get_optouts(self):
         """
@@ -184,93 +518,120 @@ class League(Base):
             list: A list of user IDs who have opted out.
         """
         current_season_optouts = self.config["optouts"]
-        rosters = Leagues.get_rosters(self.league_id)
+        rosters = RosterCache.get(self.league_id, final=self._is_final())
         return [
             roster["roster_id"]
             for roster in rosters
             if roster["owner_id"] in current_season_optouts
         ]
 
-    def fetch_matchups(self):
+    def fetch_matchups(self, concurrent=True, max_workers=None, weeks=None):
         """
         Fetches matchups for the weeks leading up to the current week.
 
+        Weeks are requested in parallel on a thread pool by default, and the
+        results are assembled in week order once every request has returned.
+
+        Args:
+            concurrent (bool): Whether to fetch the weeks in parallel (default: True).
+            max_workers (int): The maximum number of concurrent requests (default: FETCH_CONCURRENCY).
+            weeks (list): The weeks to fetch into the existing matchups. If None, all weeks are refetched.
+
         Returns:
-            dict: A dictionary where keys are week numbers and values are lists of matchups.
+            WeekIndex: The matchups of each week, each tagged with its week number.
         """
-        matchups = {}
-        for week in range(int(self.OPENING_WEEK), int(self.week) + 1):
-            matchups[week] = Leagues.get_matchups(self.league_id, week)
-            matchups_db = pd.DataFrame(matchups[week])
-            matchups_db["league_id"] = self.league_id
-            matchups_db["week"] = week
-        self.matchups = matchups
+        self._frames = None
+        self._season_aggregate = None
+        if weeks is None:
+            self.matchups = WeekIndex()
+            weeks = list(range(int(self.OPENING_WEEK), int(self.week) + 1))
+        if concurrent and len(weeks) > 1:
+            with ThreadPoolExecutor(
+                max_workers=max_workers or self.FETCH_CONCURRENCY
+            ) as executor:
+                results = executor.map(self._fetch_week_matchups, weeks)
+                matchups = dict(zip(weeks, results))
+        else:
+            matchups = {week: self._fetch_week_matchups(week) for week in weeks}
+        for week, week_matchups in matchups.items():
+            for matchup in week_matchups:
+                matchup["week"] = week
+            self.matchups.set_week(week, week_matchups)
 
-    def get_head_to_head(self):
+    def _fetch_week_matchups(self, week):
         """
-        Extracts matchup information from the provided matchups.
+        Fetches the matchups for a single week, cached permanently once the week is final.
 
         Args:
-            week (int): The week number to filter matchups. If None, all weeks are considered.
+            week (int): The week number to fetch.
 
         Returns:
-            list: A list of dictionaries containing matchup information.
+            list: A list of matchups for the week.
         """
+        return SleeperCache.get_matchups(
+            self.league_id, week, final=self._is_final(week)
+        )
 
-        matchup_info = []
-        for week_num, week_matchups in self.matchups.items():
-            matchups_by_id = {}  # Group matchups by matchup_id
-            for matchup in week_matchups:
-                matchup_id = matchup["matchup_id"]
-                if matchup_id not in matchups_by_id:
-                    matchups_by_id[matchup_id] = []
-                matchups_by_id[matchup_id].append(matchup)
-
-            # Iterate over matchups grouped by matchup_id
-            for matchup_id, matchups in matchups_by_id.items():
-                winner = max(matchups, key=lambda x: x["points"])
-                loser = min(matchups, key=lambda x: x["points"])
-                matchup_dict = {
-                    "week": week_num,
-                    "matchup_id": matchup_id,
-                    "matchup_winner": winner["roster_id"],
-                    "matchup_loser": loser["roster_id"],
-                    "winner_points": winner["points"],
-                    "loser_points": loser["points"],
-                    "matchup_margin": winner["points"] - loser["points"],
-                }
-                matchup_info.append(matchup_dict)
-        self.head_to_head = matchup_info
+    def get_head_to_head(self, weeks=None):
+        """
+        Extracts matchup information from the provided matchups.
+
+        Every requested week is derived in one batch by `derive_head_to_head`, which skips bye and
+        unpaired matchups and records ties with the first listed team as the winner.
+
+        Args:
+            weeks (list): The weeks to rederive into the existing head-to-head rows. If None, all weeks are derived.
+
+        Returns:
+            WeekIndex: The head-to-head results of each week.
+        """
 
-    def fetch_player_stats(self):
+        self._frames = None
+        self._season_aggregate = None
+        if weeks is None:
+            self.head_to_head = WeekIndex()
+            weeks = self.matchups.weeks()
+        rows_by_week = {week_num: [] for week_num in weeks}
+        for row in derive_head_to_head(self.matchups.rows(weeks=weeks)):
+            rows_by_week[row["week"]].append(row)
+        for week_num, matchup_info in rows_by_week.items():
+            self.head_to_head.set_week(week_num, matchup_info)
+
+    def fetch_player_stats(self, weeks=None):
         """
         Extracts player scores from the provided matchups for the weeks leading up to the current week.
 
+        Args:
+            weeks (list): The weeks to rederive into the existing player scores. If None, all weeks are derived.
+
         Returns:
-            list: A list of dictionaries containing player scores.
+            WeekIndex: The starters' scores of each week.
         """
-        player_stats = []
-        player_list = Players.get_all_players()
-        for week_num, week_matchups in self.matchups.items():
+        self._frames = None
+        self._season_aggregate = None
+        if weeks is None:
+            self.player_stats = WeekIndex()
+            weeks = self.matchups.weeks()
+        for week_num in weeks:
             if (self.OPENING_WEEK is not None and week_num < self.OPENING_WEEK) or (
                 self.week is not None and week_num > self.week
             ):
                 continue
-            for matchup in week_matchups:
+            player_stats = []
+            for matchup in self.matchups.rows(week_num):
                 for key, value in matchup["players_points"].items():
                     if key in matchup["starters"]:
+                        player_name, position = PlayerDirectory.lookup(key)
                         player = {
                             "player_id": key,
                             "week": week_num,
                             "score": value,
                             "roster_id": matchup["roster_id"],
-                            "position": player_list.get(key, {}).get("position"),
-                            "player_name": player_list.get(key, {}).get(
-                                "full_name"
-                            ),
+                            "position": position,
+                            "player_name": player_name,
                         }
                         player_stats.append(player)
-        self.player_stats = player_stats
+            self.player_stats.set_week(week_num, player_stats)
 
     def fetch_team_stats(self):
         """
@@ -279,7 +640,7 @@ class League(Base):
         Returns:
             list: A list of dictionaries containing team statistics.
         """
-        rosters = Leagues.get_rosters(self.league_id)
+        rosters = RosterCache.get(self.league_id, final=self._is_final())
 
         teams_stats = []
         for roster in rosters:
@@ -296,10 +657,13 @@ class League(Base):
                 }
             )
         self.team_stats = teams_stats
+        self._frames = None
+        self._season_aggregate = None
 
     def setup_pools(self):
         """
         Initializes pools and fetches matchups for the league.
+        All pools are written with a single bulk insert.
         Validates that the total payout amounts of side and main pools are equal to the respective pots.
 
         Args:
@@ -311,8 +675,9 @@ class League(Base):
         from .pool import Pool
         pools_list = Pool.create_pools(self)
         pools = {pool.pool_id: pool for pool in pools_list}
-        db.session.add_all(pools_list)
-        db.session.commit()
+        with session_scope() as db:
+            Pool.bulk_insert(db, pools_list)
+            LeagueGeneration.bump(db, self.league_id)
 
         # # Validate the total payout amounts of side and main pools
         # side_payout_total = sum(
@@ -352,6 +717,42 @@ class League(Base):
         )
         return attr_string
 
-    def fetch_playoffs(self):
-        self.playoffs = Leagues.get_winners_playoff_bracket(self.league_id)
+    def fetch_playoffs(self, refresh=False):
+        """
+        Fetches the winners playoff bracket and indexes its matches by (round, match).
+
+        The bracket is requested once per league and reused by every later call. On disk it is
+        kept for `SleeperCache.LIVE_TTL` seconds until its last round is decided, then permanently.
+
+        Args:
+            refresh (bool): Whether to request the bracket from Sleeper again, skipping both the
+                in-memory index and the on-disk cache (default: False).
+
+        Returns:
+            dict: A mapping of (round, match) to the bracket match.
+        """
+        if self._playoff_index is None or refresh:
+            self.playoffs = (
+                SleeperCache.get_winners_playoff_bracket(
+                    self.league_id, final=self._is_final(), refresh=refresh
+                )
+                or []
+            )
+            self._playoff_index = {
+                (match["r"], match["m"]): match for match in self.playoffs
+            }
+        return self._playoff_index
+
+    def playoff_match(self, round, match):
+        """
+        Gets a match of the winners playoff bracket.
+
+        Args:
+            round (int): The round of the match.
+            match (int): The match number.
+
+        Returns:
+            dict: The bracket match, or None if the bracket has no such match.
+        """
+        return self.fetch_playoffs().get((round, match))
         
\ No newline at end of file
@@ -1,57 +1,143 @@
-from sqlalchemy import func
+from sqlalchemy import func, select
 from ..models.league import League
 from ..models.pool import Pool
 from ..models.user import User
 
-from ..database import get_db
-from sqlalchemy.orm import scoped_session
+from ..database import async_session_scope, session_scope
 
-def get_user_payouts(season=None):
-    db = next(get_db())
-    query = db.query(Pool).join(League, Pool.league_id == League.league_id).filter(Pool.paid == True)
-    
+
+def _user_payouts_query(season=None):
+    query = (
+        select(
+            Pool.winner,
+            User.name,
+            Pool.pool_type,
+            func.sum(Pool.payout_amount).label('amount'),
+        )
+        .join(League, Pool.league_id == League.league_id)
+        .outerjoin(User, Pool.winner == User.username)
+        .where(Pool.paid == True)
+        .group_by(Pool.winner, User.name, Pool.pool_type)
+    )
     if season is not None:
-        query = query.filter(League.season == season)
-    
-    payouts = query.group_by(Pool.winner, Pool.pool_type).with_entities(
-        Pool.winner,
-        Pool.pool_type,
-        func.sum(Pool.payout_amount).label('amount')
-    ).all()
-
-    user_payouts = []
-    for winner, pool_type, amount in payouts:
-        user = db.query(User).get(winner)
-        user_payout = {
-            'username': winner,
-            'name': user.name,
-            'amount': float(amount),
-            'pool_type': pool_type
-        }
-        user_payouts.append(user_payout)
-
-    return user_payouts
+        query = query.where(League.season == season)
+    return query
 
-def get_payout_details(season=None, username=None):
-    db = next(get_db())
-    query = db.query(Pool, League).join(League, Pool.league_id == League.league_id).filter(Pool.paid == True)
+
+def _payout_details_query(season=None, username=None):
+    query = (
+        select(
+            League.season,
+            Pool.label,
+            Pool.payout_amount,
+            Pool.week,
+            Pool.winner,
+            Pool.pool_type,
+            User.name,
+            Pool.paid,
+        )
+        .join(League, Pool.league_id == League.league_id)
+        .outerjoin(User, Pool.winner == User.username)
+        .where(Pool.paid == True)
+        .order_by(League.season.desc(), Pool.week.desc())
+    )
     if season is not None:
-        query = query.filter(League.season == season)
+        query = query.where(League.season == season)
     if username is not None:
-        query = query.filter(Pool.winner == username)
-
-    payout_details = []
-    for pool, league in query.all():
-        user = db.query(User).get(pool.winner)
-        payout_detail = {
-            'season': str(league.season),
-            'pool': pool.label,
-            'amount': float(pool.payout_amount),
-            'week': int(pool.week),
-            'name': user.name,
-            'paid': pool.paid
-        }
-        payout_details.append(payout_detail)
-    payout_details.sort(key=lambda x: (x['season'], x['week']), reverse=True)
-    return payout_details
+        query = query.where(Pool.winner == username)
+    return query
+
+
+def _payout_seasons_query():
+    return (
+        select(League.season)
+        .join(Pool, League.league_id == Pool.league_id, isouter=True)
+        .where(Pool.payout_amount != None)
+        .group_by(League.season)
+        .order_by(League.season.desc())
+    )
+
+
+def _user_payout(row):
+    return {
+        'username': row.winner,
+        'name': row.name,
+        'amount': float(row.amount),
+        'pool_type': row.pool_type
+    }
+
+
+def _payout_detail(row):
+    return {
+        'season': str(row.season),
+        'pool': row.label,
+        'amount': float(row.payout_amount),
+        'week': int(row.week),
+        'name': row.name,
+        'paid': row.paid
+    }
+
+
+def get_user_payouts(season=None):
+    with session_scope() as db:
+        rows = db.execute(_user_payouts_query(season)).all()
+    return [_user_payout(row) for row in rows]
+
+
+def get_payout_details(season=None, username=None):
+    with session_scope() as db:
+        rows = db.execute(_payout_details_query(season, username)).all()
+    return [_payout_detail(row) for row in rows]
+
+
+def get_payout_seasons():
+    with session_scope() as db:
+        return list(db.execute(_payout_seasons_query()).scalars())
+
+
+async def get_payout_seasons_async():
+    async with async_session_scope() as db:
+        return list((await db.execute(_payout_seasons_query())).scalars())
+
+
+def get_payouts(season=None, username=None):
+    """
+    Fetches the per-user payout totals and the payout details with a single query.
+
+    The totals are summed from the detail rows, so both sets come from one round trip.
+
+    Args:
+        season (int): The season to filter payouts by. If None, all seasons are included.
+        username (str): The winner to filter payouts by. If None, all users are included.
+
+    Returns:
+        tuple: The user payouts and the payout details, shaped like get_user_payouts and get_payout_details.
+    """
+    with session_scope() as db:
+        rows = db.execute(_payout_details_query(season, username)).all()
+    return _split_payouts(rows)
+
+
+async def get_payouts_async(season=None, username=None):
+    """
+    Async variant of get_payouts, running on its own async session.
+    """
+    async with async_session_scope() as db:
+        rows = (await db.execute(_payout_details_query(season, username))).all()
+    return _split_payouts(rows)
+
+
+def _split_payouts(rows):
+    user_payouts = {}
+    for row in rows:
+        key = (row.winner, row.pool_type)
+        if key not in user_payouts:
+            user_payouts[key] = {
+                'username': row.winner,
+                'name': row.name,
+                'amount': 0.0,
+                'pool_type': row.pool_type
+            }
+        user_payouts[key]['amount'] += float(row.payout_amount)
 
+    return list(user_payouts.values()), [_payout_detail(row) for row in rows]
@@ -0,0 +1,135 @@
+"""
+Players Module
+==============
+
+The Players module provides a compact local directory of Sleeper players.
+
+The full Sleeper player dump is several megabytes of JSON, while the league only needs each
+player's name and position. The directory keeps just those fields in a SQLite file that is
+refreshed from Sleeper at most once per `REFRESH_INTERVAL`, and serves lookups from memory.
+
+Classes:
+    PlayerDirectory: A SQLite-backed index of player names and positions.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from sleeperpy import Players
+
+from .sleeper_cache import SleeperCache
+
+
+class PlayerDirectory:
+    """
+    A SQLite-backed index of player names and positions.
+    """
+
+    DB_PATH = os.path.join(SleeperCache.CACHE_DIR, "players.sqlite")
+    REFRESH_INTERVAL = 86400
+
+    _players = None
+    _loaded_at = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def _connect(cls):
+        """
+        Opens the directory database, creating its tables if needed.
+
+        Returns:
+            sqlite3.Connection: The database connection.
+        """
+        os.makedirs(os.path.dirname(cls.DB_PATH), exist_ok=True)
+        con = sqlite3.connect(cls.DB_PATH)
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS players "
+            "(player_id TEXT PRIMARY KEY, full_name TEXT, position TEXT)"
+        )
+        con.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL)")
+        return con
+
+    @classmethod
+    def _refreshed_at(cls, con):
+        """
+        Gets the time the directory was last refreshed from Sleeper.
+
+        Args:
+            con (sqlite3.Connection): The database connection.
+
+        Returns:
+            float: The refresh timestamp, or 0 if the directory has never been filled.
+        """
+        row = con.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+        return row[0] if row else 0
+
+    @classmethod
+    def refresh(cls, force=False):
+        """
+        Rebuilds the directory from the Sleeper player dump if it is older than `REFRESH_INTERVAL`.
+
+        Args:
+            force (bool): Whether to rebuild the directory regardless of its age (default: False).
+        """
+        with cls._lock:
+            con = cls._connect()
+            try:
+                if not force and time.time() - cls._refreshed_at(con) < cls.REFRESH_INTERVAL:
+                    return
+                player_list = Players.get_all_players()
+                if not player_list:
+                    return
+                with con:
+                    con.execute("DELETE FROM players")
+                    con.executemany(
+                        "INSERT INTO players VALUES (?, ?, ?)",
+                        (
+                            (player_id, player.get("full_name"), player.get("position"))
+                            for player_id, player in player_list.items()
+                        ),
+                    )
+                    con.execute(
+                        "INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)",
+                        (time.time(),),
+                    )
+                cls._players = None
+            finally:
+                con.close()
+
+    @classmethod
+    def _load(cls):
+        """
+        Loads the directory into memory, refreshing it first if it is stale.
+
+        Returns:
+            dict: A mapping of player ID to a (full_name, position) tuple.
+        """
+        if cls._players is not None and time.time() - cls._loaded_at < cls.REFRESH_INTERVAL:
+            return cls._players
+        cls.refresh()
+        con = cls._connect()
+        try:
+            players = {
+                player_id: (full_name, position)
+                for player_id, full_name, position in con.execute("SELECT * FROM players")
+            }
+        finally:
+            con.close()
+        cls._players = players
+        cls._loaded_at = time.time()
+        return players
+
+    @classmethod
+    def lookup(cls, player_id):
+        """
+        Gets the name and position of a player.
+
+        Args:
+            player_id (str): The Sleeper ID of the player.
+
+        Returns:
+            tuple: The player's (full_name, position), or (None, None) if the player is unknown.
+        """
+        return cls._load().get(player_id, (None, None))
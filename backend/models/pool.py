@@ -10,6 +10,8 @@ implementations for specific pool types such as weekly, seasonal, and special we
 from abc import ABC, abstractmethod, ABCMeta
 from decimal import Decimal
 from sqlalchemy import (
+    delete,
+    insert,
     update,
     Column,
     String,
@@ -26,11 +28,13 @@ from venmo_api import Client
 
 from sqlalchemy.ext.declarative import declarative_base, DeclarativeMeta, declared_attr
 
-from ..database import db
+from ..database import session_scope
 
 from .stats import *
 from .user import User
 from .league import League
+from .snapshot import LeaderboardSnapshot
+from .generation import LeagueGeneration
 
 class PoolMetaclass(DeclarativeMeta, ABCMeta):
     pass
@@ -76,9 +80,6 @@ class Pool(Base):
         self.week = week
         self.paid = False
         self.label = pool_id.replace("_", " ").title()
-        
-        if db:
-            self.db = db
 
     def __str__(self):
         """
@@ -112,14 +113,47 @@ class Pool(Base):
             "pool_class": self.pool_class,
         }
 
-    def set_winner(self):
+    @classmethod
+    def bulk_insert(cls, db, pools):
         """
-        Set the winner of the pool.
+        Inserts pools through the pools table, with one statement per shape of row.
+
+        An explicit None would be bound as the JSON 'null', so pools without a winner payload
+        leave the column out and store SQL NULL.
+
+        Args:
+            db (Session): The session to write in.
+            pools (List): The pools to insert.
+        """
+        with_payload, without_payload = [], []
+        for pool in pools:
+            row = pool.to_dict()
+            if row["winner_payload"] is None:
+                del row["winner_payload"]
+                without_payload.append(row)
+            else:
+                with_payload.append(row)
+        for rows in (with_payload, without_payload):
+            if rows:
+                db.execute(insert(cls.__table__), rows)
+
+    def evaluate(self):
         """
-        winner = self.set_pool_winner()[0]["roster_id"]
+        Evaluate the pool's winner, computing the underlying stat once.
 
+        Returns:
+            tuple: The winning roster ID and the payload to store with the winner.
+        """
+        result = self.set_pool_winner()
         if self.pool_type == "side" and self.pool_subtype != "prop":
-            self.winner_payload = self.set_pool_winner()
+            self.winner_payload = result
+        return result[0]["roster_id"], self.winner_payload
+
+    def set_winner(self):
+        """
+        Set the winner of the pool.
+        """
+        winner, _ = self.evaluate()
 
         user = User.get_user_by_roster_id(winner, self.league_id)
 
@@ -130,8 +164,9 @@ class Pool(Base):
                 .where(Pool.league_id == self.league_id)
                 .values(winner=user.username)
             )
-            db.session.execute(stmt)
-            db.session.commit()
+            with session_scope() as db:
+                db.execute(stmt)
+                LeagueGeneration.bump(db, self.league_id)
         else:
             print(
                 f"User with roster_id {self.winner} not found in league {self.league_id}"
@@ -184,7 +219,15 @@ class Pool(Base):
                 )
                 logging.info(f"Payment sent to {self.winner} via Venmo: {payment_info}")
                 self.paid = True
-                db.session.commit()
+                pools_table = Pool.__table__
+                with session_scope() as db:
+                    db.execute(
+                        update(pools_table)
+                        .where(pools_table.c.pool_id == self.pool_id)
+                        .where(pools_table.c.league_id == self.league_id)
+                        .values(paid=True)
+                    )
+                    LeagueGeneration.bump(db, self.league_id)
                 return True
             else:
                 return False
@@ -273,10 +316,9 @@ class SidePool(Pool):
 
     def set_payout_amount(self):
         """
-        Set the payout amount for the side pool.
+        Set the payout amount for the side pool from the side pot of the league in hand.
         """
-        side_pot = League.query.filter_by(league_id=self.league_id).first().side_pot
-        return round(self.payout_pct * side_pot, 2)
+        return round(self.payout_pct * self.league.side_pot, 2)
 
 
 class MainPool(Pool):
@@ -302,10 +344,9 @@ class MainPool(Pool):
 
     def set_payout_amount(self):
         """
-        Set the payout amount for the main pool.
+        Set the payout amount for the main pool from the main pot of the league in hand.
         """
-        main_pot = League.query.filter_by(league_id=self.league_id).first().main_pot
-        return round(self.payout_pct * main_pot, 2)
+        return round(self.payout_pct * self.league.main_pot, 2)
 
 
 class SeasonPool(SidePool):
@@ -328,12 +369,70 @@ class SeasonPool(SidePool):
         super().__init__(league, pool_id, payout_pct, league.LAST_WEEK)
         self.pool_subtype = pool_subtype
 
-    @abstractmethod
+    # Whether leaderboard entries carry an opponent whose username should be resolved.
+    opponent_leaderboard = False
+
+    def set_pool_winner(self):
+        """
+        Reads the winner of the season pool from the league's season aggregate.
+        """
+        return self.league.season_aggregate.winner(self.pool_class)
+
     def get_leaderboard(self):
         """
-        Abstract method to get the leaderboard for the season pool.
+        Reads the leaderboard of the season pool from its latest snapshot.
+
+        Falls back to computing it when no snapshot has been stored yet.
+
+        Returns:
+            list: The leaderboard entries with usernames attached.
         """
-        pass
+        leaderboard = LeaderboardSnapshot.get_leaderboard(self.league_id, self.pool_id)
+        if leaderboard is None:
+            leaderboard = self.compute_leaderboard()
+        return leaderboard
+
+    def compute_leaderboard(self):
+        """
+        Computes the leaderboard of the season pool from the league's season aggregate.
+
+        Every season pool of a league shares one aggregate, so the league's data is fetched
+        and scanned once no matter how many leaderboards are computed. A pool loaded without
+        its league loads it from the database.
+
+        Returns:
+            list: The leaderboard entries with usernames attached.
+        """
+        if getattr(self, "league", None) is None:
+            self.league = League.load(self.league_id)
+        leaderboard = self.league.season_aggregate.leaderboard(self.pool_class)
+        return self.attach_users(leaderboard, opponent=self.opponent_leaderboard)
+
+    def attach_users(self, leaderboard, opponent=False):
+        """
+        Adds the username, and optionally the opponent's username, to each leaderboard entry.
+
+        The league's roster to user map is loaded with one query and reused for the rest of the
+        request through the pool's league.
+
+        Args:
+            leaderboard (list): The leaderboard entries, each with a roster_id.
+            opponent (bool): Whether to also resolve each entry's opponent_id (default: False).
+
+        Returns:
+            list: The leaderboard entries with usernames attached.
+        """
+        users = getattr(self.league, "users_by_roster_id", None)
+        if users is None:
+            users = User.get_users_by_roster_id(self.league_id)
+            self.league.users_by_roster_id = users
+        for entry in leaderboard:
+            user = users.get(int(entry["roster_id"]))
+            entry["username"] = user.username if user else None
+            if opponent:
+                opponent_user = users.get(int(entry["opponent_id"]))
+                entry["opponent"] = opponent_user.username if opponent_user else None
+        return leaderboard
 
 
 class SpecialWeekPool(SidePool):
@@ -356,7 +455,33 @@ class SpecialWeekPool(SidePool):
         super().__init__(league, pool_id, payout_pct, week)
         self.pool_subtype = "special_week"
 
-    def split_pool(self):
+    @property
+    def matchup_id(self):
+        """
+        The matchup a pool created by `split_pool` pays out, or None for an unsplit pool.
+
+        Split pools loaded from the database take it from the suffix of their pool ID.
+        """
+        matchup_id = self.__dict__.get("_matchup_id")
+        if matchup_id is None and self.pool_id:
+            suffix = self.pool_id.rsplit("_", 1)[-1]
+            matchup_id = int(suffix) if suffix.isdigit() else None
+        return matchup_id
+
+    @matchup_id.setter
+    def matchup_id(self, value):
+        self._matchup_id = value
+
+    def split_pool(self, db=None):
+        """
+        Replaces the pool with one pool per matchup winner of its week, each paying an equal share.
+
+        Args:
+            db (Session): The session to write the split in. If None, it is committed on its own.
+
+        Returns:
+            List: The pools of the split, one per winner.
+        """
         winners = MatchupStats.get_head_to_head_winners(self.league, week=self.week)
         payout_amount = self.payout_amount / len(winners)
         pools = []
@@ -368,11 +493,30 @@ class SpecialWeekPool(SidePool):
             pool_instance.matchup_id = winner["matchup_id"]
             pool_instance.pool_id = self.pool_id + "_" + str(pool_instance.matchup_id)
             pools.append(pool_instance)
-            db.session.add(pool_instance)
-        db.session.delete(self)
-        db.session.commit()
+        if db is None:
+            with session_scope() as db:
+                self._write_split(db, pools)
+        else:
+            self._write_split(db, pools)
         return pools
 
+    def _write_split(self, db, pools):
+        """
+        Inserts the pools of a split and deletes the pool they replace.
+
+        Args:
+            db (Session): The session to write in.
+            pools (List): The pools of the split.
+        """
+        pools_table = Pool.__table__
+        Pool.bulk_insert(db, pools)
+        db.execute(
+            delete(pools_table)
+            .where(pools_table.c.pool_id == self.pool_id)
+            .where(pools_table.c.league_id == self.league_id)
+        )
+        LeagueGeneration.bump(db, self.league_id)
+
 
 class WeeklyPool(SidePool):
     """
@@ -579,18 +723,6 @@ class RegularSeasonFirstPlacePool(SeasonPool):
         )
         self.pool_class = self.__mapper_args__["polymorphic_identity"]
 
-    def set_pool_winner(self):
-        return LeagueStats.get_regular_season_first_place(self.league)
-
-    def get_leaderboard(self):
-        league = self.league
-        league.fetch_team_stats()
-        leaderboard = LeagueStats.get_regular_season_first_place(league, top_n=12)
-        for entry in leaderboard:
-            user = User.get_user_by_roster_id(int(entry["roster_id"]), self.league_id)
-            entry["username"] = user.username
-        return leaderboard
-
 
 class RegularSeasonMostPointsPool(SeasonPool):
     __mapper_args__ = {
@@ -606,18 +738,6 @@ class RegularSeasonMostPointsPool(SeasonPool):
         )
         self.pool_class = self.__mapper_args__["polymorphic_identity"]
 
-    def set_pool_winner(self):
-        return LeagueStats.get_regular_season_most_points(self.league)
-
-    def get_leaderboard(self):
-        league = self.league
-        league.fetch_team_stats()
-        leaderboard = LeagueStats.get_regular_season_most_points(league, top_n=12)
-        for entry in leaderboard:
-            user = User.get_user_by_roster_id(int(entry["roster_id"]), self.league_id)
-            entry["username"] = user.username
-        return leaderboard
-
 
 class RegularSeasonMostPointsAgainstPool(SeasonPool):
     __mapper_args__ = {
@@ -633,20 +753,6 @@ class RegularSeasonMostPointsAgainstPool(SeasonPool):
         )
         self.pool_class = self.__mapper_args__["polymorphic_identity"]
 
-    def set_pool_winner(self):
-        return LeagueStats.get_regular_season_most_points_against(self.league)
-
-    def get_leaderboard(self):
-        league = self.league
-        league.fetch_team_stats()
-        leaderboard = LeagueStats.get_regular_season_most_points_against(
-            league, top_n=12
-        )
-        for entry in leaderboard:
-            user = User.get_user_by_roster_id(int(entry["roster_id"]), self.league_id)
-            entry["username"] = user.username
-        return leaderboard
-
 
 class RegularSeasonHighestScoringPlayerPool(SeasonPool):
     __mapper_args__ = {
@@ -662,21 +768,6 @@ class RegularSeasonHighestScoringPlayerPool(SeasonPool):
         )
         self.pool_class = self.__mapper_args__["polymorphic_identity"]
 
-    def set_pool_winner(self):
-        return PlayerStats.get_regular_season_high_scoring_player(self.league)
-
-    def get_leaderboard(self):
-        league = self.league
-        league.fetch_matchups()
-        league.fetch_player_stats()
-        leaderboard = PlayerStats.get_regular_season_high_scoring_player(
-            league, top_n=12
-        )
-        for entry in leaderboard:
-            user = User.get_user_by_roster_id(int(entry["roster_id"]), self.league_id)
-            entry["username"] = user.username
-        return leaderboard
-
 
 class OneWeekHighestScorePool(SeasonPool):
     __mapper_args__ = {
@@ -692,20 +783,10 @@ class OneWeekHighestScorePool(SeasonPool):
         )
         self.pool_class = self.__mapper_args__["polymorphic_identity"]
 
-    def set_pool_winner(self):
-        return MatchupStats.get_high_team_score(self.league, week=None)
-
-    def get_leaderboard(self):
-        league = self.league
-        league.fetch_matchups()
-        leaderboard = MatchupStats.get_high_team_score(league, week=None, top_n=12)
-        for entry in leaderboard:
-            user = User.get_user_by_roster_id(int(entry["roster_id"]), self.league_id)
-            entry["username"] = user.username
-        return leaderboard
-
 
 class OneWeekHighestScoreAgainstPool(SeasonPool):
+    opponent_leaderboard = True
+
     __mapper_args__ = {
         "polymorphic_identity": "OneWeekHighestScoreAgainstPool",
     }
@@ -719,25 +800,6 @@ class OneWeekHighestScoreAgainstPool(SeasonPool):
         )
         self.pool_class = self.__mapper_args__["polymorphic_identity"]
 
-    def set_pool_winner(self):
-        return MatchupStats.get_high_score_against(self.league, week=None)
-
-    def get_leaderboard(self):
-        league = self.league
-        league.fetch_matchups()
-        league.get_head_to_head()
-        leaderboard = MatchupStats.get_high_score_against(
-            self.league, week=None, top_n=12
-        )
-        for entry in leaderboard:
-            user = User.get_user_by_roster_id(entry["roster_id"], self.league_id)
-            opponent = User.get_user_by_roster_id(
-                (entry["opponent_id"]), self.league_id
-            )
-            entry["username"] = user.username
-            entry["opponent"] = opponent.username
-        return leaderboard
-
 
 class OneWeekHighestScoringPlayerPool(SeasonPool):
     __mapper_args__ = {
@@ -753,21 +815,10 @@ class OneWeekHighestScoringPlayerPool(SeasonPool):
         )
         self.pool_class = self.__mapper_args__["polymorphic_identity"]
 
-    def set_pool_winner(self):
-        return PlayerStats.get_high_player_score(self.league, week=None)
-
-    def get_leaderboard(self):
-        league = self.league
-        league.fetch_matchups()
-        league.fetch_player_stats()
-        leaderboard = PlayerStats.get_high_player_score(self.league, week=None, top_n=12)
-        for entry in leaderboard:
-            user = User.get_user_by_roster_id(entry["roster_id"], self.league_id)
-            entry["username"] = user.username
-        return leaderboard
-
 
 class OneWeekSmallestMarginPool(SeasonPool):
+    opponent_leaderboard = True
+
     __mapper_args__ = {
         "polymorphic_identity": "OneWeekSmallestMarginPool",
     }
@@ -781,25 +832,6 @@ class OneWeekSmallestMarginPool(SeasonPool):
         )
         self.pool_class = self.__mapper_args__["polymorphic_identity"]
 
-    def set_pool_winner(self):
-        return MatchupStats.get_small_scoring_margin(self.league, week=None)
-
-    def get_leaderboard(self):
-        league = self.league
-        league.fetch_matchups()
-        league.get_head_to_head()
-        leaderboard = MatchupStats.get_small_scoring_margin(
-            self.league, week=None, top_n=12
-        )
-        for entry in leaderboard:
-            user = User.get_user_by_roster_id(entry["roster_id"], self.league_id)
-            opponent = User.get_user_by_roster_id(
-                (entry["opponent_id"]), self.league_id
-            )
-            entry["username"] = user.username
-            entry["opponent"] = opponent.username
-        return leaderboard
-
 
 class OpeningWeekWinnersPool(SpecialWeekPool):
     __mapper_args__ = {
@@ -890,12 +922,7 @@ class LeagueWinner(MainPool):
         """
         Set the winner of the pool.
         """
-        league = self.league
-        league.fetch_playoffs()
-        match = next(
-            (match for match in league.playoffs if match["r"] == 3 and match["m"] == 6),
-            None,
-        )
+        match = self.league.playoff_match(*self.league.CHAMPIONSHIP_MATCH)
         self.winner_payload = match
         return [{"roster_id": match.get("w")}]
 
@@ -917,12 +944,7 @@ class LeagueRunnerUp(MainPool):
         """
         Set the winner of the pool.
         """
-        league = self.league
-        league.fetch_playoffs()
-        match = next(
-            (match for match in league.playoffs if match["r"] == 3 and match["m"] == 6),
-            None,
-        )
+        match = self.league.playoff_match(*self.league.CHAMPIONSHIP_MATCH)
         self.winner_payload = match
         return [{"roster_id": match.get("l")}]
 
@@ -944,11 +966,6 @@ class LeagueThirdPlace(MainPool):
         """
         Set the winner of the pool.
         """
-        league = self.league
-        league.fetch_playoffs()
-        match = next(
-            (match for match in league.playoffs if match["r"] == 3 and match["m"] == 7),
-            None,
-        )
+        match = self.league.playoff_match(*self.league.THIRD_PLACE_MATCH)
         self.winner_payload = match
         return [{"roster_id": match.get("w")}]
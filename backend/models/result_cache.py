@@ -0,0 +1,223 @@
+"""
+Result Cache Module
+===================
+
+The Result Cache module provides a cache of computed page results shared by every worker.
+
+`st.cache_data` only lives inside one Streamlit process, so each worker used to recompute the
+same pools and payouts on its own. Results stored here are visible to every process that points
+at the same backend, so a cold worker is warm from its first request. Keys should include the
+league data generation, which lets entries stay valid until the data changes.
+
+The SQLite backend runs in WAL mode, which needs shared memory between its readers and writers,
+so it is shared by the workers of one host only. Its file must be on a local disk, not a network
+filesystem. Workers on other hosts each keep their own cache file.
+
+The backend is chosen from the environment:
+
+    RESULT_CACHE: "sqlite" (default) or "none" to disable sharing.
+    RESULT_CACHE_PATH: The SQLite file, on a local disk (default: .cache/results.sqlite).
+    RESULT_CACHE_MAX_MB: The size bound of the SQLite cache in megabytes (default: 256).
+
+Classes:
+    ResultCache: The interface of a shared result cache backend.
+    NullResultCache: A backend that stores nothing.
+    SQLiteResultCache: A size-bounded LRU backend in a SQLite file.
+
+Functions:
+    get_result_cache: Gets the configured result cache backend.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class ResultCache(ABC):
+    """
+    The interface of a shared result cache backend. Values must be picklable.
+    """
+
+    @abstractmethod
+    def get(self, key):
+        """
+        Gets a cached result.
+
+        Args:
+            key (tuple): The cache key, made of picklable primitives.
+
+        Returns:
+            tuple: (True, value) on a hit, or (False, None) on a miss.
+        """
+
+    @abstractmethod
+    def set(self, key, value):
+        """
+        Stores a result.
+
+        Args:
+            key (tuple): The cache key, made of picklable primitives.
+            value: The result to store.
+        """
+
+    def get_or_set(self, key, compute):
+        """
+        Returns the cached result for a key, computing and storing it on a miss.
+
+        Args:
+            key (tuple): The cache key, made of picklable primitives.
+            compute (callable): A function that computes the result.
+
+        Returns:
+            The cached or freshly computed result.
+        """
+        hit, value = self.get(key)
+        if hit:
+            return value
+        value = compute()
+        self.set(key, value)
+        return value
+
+    @staticmethod
+    def _digest(key):
+        """
+        Hashes a cache key to a fixed-length string.
+        """
+        return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+
+class NullResultCache(ResultCache):
+    """
+    A backend that stores nothing, so every lookup computes the result.
+    """
+
+    def get(self, key):
+        return False, None
+
+    def set(self, key, value):
+        pass
+
+
+class SQLiteResultCache(ResultCache):
+    """
+    A size-bounded LRU backend in a SQLite file, shared by the worker processes of one host.
+
+    A read refreshes the entry's access time only if it is older than `TOUCH_INTERVAL` seconds,
+    so most hits are plain reads and never wait for the write lock. When a write pushes the
+    total size over `max_bytes`, the least recently used entries are evicted in the same
+    transaction. The database runs in WAL mode, so concurrent workers can read while one of
+    them writes. Each thread keeps one open connection.
+    """
+
+    TOUCH_INTERVAL = 60
+
+    def __init__(self, path, max_bytes):
+        """
+        Initializes a SQLiteResultCache.
+
+        Args:
+            path (str): The path of the SQLite file.
+            max_bytes (int): The maximum total size of the stored results.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+    def _connect(self):
+        """
+        Opens the cache database, creating its table if needed.
+
+        Returns:
+            sqlite3.Connection: The database connection, in autocommit mode.
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        con = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed_at REAL)"
+        )
+        con.execute("CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)")
+        return con
+
+    def _connection(self):
+        """
+        Gets the calling thread's connection, opening it on first use.
+
+        Returns:
+            sqlite3.Connection: The thread's database connection.
+        """
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = self._local.con = self._connect()
+        return con
+
+    def get(self, key):
+        digest = self._digest(key)
+        con = self._connection()
+        row = con.execute(
+            "SELECT value, accessed_at FROM results WHERE key = ?", (digest,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        now = time.time()
+        if now - row[1] > self.TOUCH_INTERVAL:
+            con.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, digest))
+        return True, pickle.loads(row[0])
+
+    def set(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        con = self._connection()
+        try:
+            con.execute("BEGIN IMMEDIATE")
+            con.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (self._digest(key), blob, len(blob), time.time()),
+            )
+            total = con.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                evicted = []
+                for evict_key, size in con.execute(
+                    "SELECT key, size FROM results ORDER BY accessed_at"
+                ):
+                    if total <= self.max_bytes:
+                        break
+                    evicted.append((evict_key,))
+                    total -= size
+                con.executemany("DELETE FROM results WHERE key = ?", evicted)
+            con.execute("COMMIT")
+        except Exception:
+            # If BEGIN itself failed there is nothing to roll back, and the original error is kept.
+            if con.in_transaction:
+                con.execute("ROLLBACK")
+            raise
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """
+    Gets the result cache backend configured by the environment, created once per process.
+
+    Returns:
+        ResultCache: The configured backend.
+    """
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            if os.environ.get("RESULT_CACHE", "sqlite").lower() == "none":
+                _result_cache = NullResultCache()
+            else:
+                _result_cache = SQLiteResultCache(
+                    os.environ.get("RESULT_CACHE_PATH", os.path.join(".cache", "results.sqlite")),
+                    int(float(os.environ.get("RESULT_CACHE_MAX_MB", 256)) * 1024 * 1024),
+                )
+    return _result_cache
@@ -0,0 +1,170 @@
+"""
+Season Aggregator Module
+========================
+
+The Season Aggregator module computes the leaderboard and winner of every season-long pool
+together.
+
+Each season pool used to fetch the league's data and scan it on its own, so rendering all
+season leaderboards multiplied the fetches and scans by the number of pools. The aggregator
+makes one pass over the league's matchups, head-to-head results, player scores and team stats,
+collects the eligible rows each pool ranks, and ranks them with `Stats.rank`. The result is
+cached on the league until its stats are fetched again, and every pool reads its slice by
+`pool_class`. Leaderboards and winners are identical to the matching `Stats` methods.
+
+Classes:
+    SeasonAggregator: The leaderboards and winners of every season pool of a league.
+"""
+
+from .stats import Stats
+
+
+class SeasonAggregator:
+    """
+    The leaderboards and winners of every season pool of a league.
+
+    Attributes:
+        top_n (int): The number of entries kept on each leaderboard.
+        leaderboards (dict): A mapping of pool class name to its leaderboard in rank order.
+    """
+
+    LEADERBOARD_SIZE = 12
+
+    def __init__(self, league, top_n=LEADERBOARD_SIZE):
+        """
+        Initializes a SeasonAggregator and aggregates the league's season.
+
+        Args:
+            league (League): The League instance, with its stats fetched.
+            top_n (int): The number of entries kept on each leaderboard (default: LEADERBOARD_SIZE).
+        """
+        self.top_n = top_n
+        self.leaderboards = self._aggregate(league)
+
+    def _aggregate(self, league):
+        """
+        Makes one pass over the league's data and ranks every season pool.
+
+        Args:
+            league (League): The League instance, with its stats fetched.
+
+        Returns:
+            dict: A mapping of pool class name to its leaderboard.
+        """
+        optout_ids = league.optout_ids
+        regular_season = set(league.REGULAR_SEASON)
+        top_n = self.top_n
+
+        team_scores = [
+            team for team in league.matchups if team["roster_id"] not in optout_ids
+        ]
+        # Tied matchups have no loser.
+        losses = [
+            match
+            for match in league.head_to_head
+            if not match.get("tie") and match["matchup_loser"] not in optout_ids
+        ]
+
+        weekly_player_scores = []
+        player_totals = {}
+        player_info = {}
+        for player in league.player_stats:
+            if player["roster_id"] in optout_ids:
+                continue
+            if player["week"] in regular_season:
+                weekly_player_scores.append(player)
+            player_id = player["player_id"]
+            if player_id in player_totals:
+                player_totals[player_id] += player["score"]
+            else:
+                player_totals[player_id] = player["score"]
+                player_info[player_id] = player
+
+        rosters = [
+            team for team in getattr(league, "team_stats", []) if team["roster_id"] not in optout_ids
+        ]
+
+        return {
+            "RegularSeasonFirstPlacePool": Stats.rank(
+                rosters, key=lambda x: (x["total_wins"], x["total_points_for"]), top_n=top_n
+            ),
+            "RegularSeasonMostPointsPool": [
+                {"roster_id": team["roster_id"], "score": team["total_points_for"]}
+                for team in Stats.rank(rosters, key=lambda x: x["total_points_for"], top_n=top_n)
+            ],
+            "RegularSeasonMostPointsAgainstPool": [
+                {"roster_id": team["roster_id"], "score": team["total_points_against"]}
+                for team in Stats.rank(
+                    rosters, key=lambda x: x["total_points_against"], top_n=top_n
+                )
+            ],
+            "RegularSeasonHighestScoringPlayerPool": [
+                {
+                    "player_id": player_id,
+                    "score": player_totals[player_id],
+                    "roster_id": player_info[player_id]["roster_id"],
+                    "position": player_info[player_id]["position"],
+                    "player_name": player_info[player_id]["player_name"],
+                }
+                for player_id in Stats.rank(player_totals, key=player_totals.get, top_n=top_n)
+            ],
+            "OneWeekHighestScorePool": [
+                {
+                    "week": team["week"],
+                    "matchup_id": team["matchup_id"],
+                    "roster_id": team["roster_id"],
+                    "score": team["points"],
+                    "opponent_id": '',
+                }
+                for team in Stats.rank(team_scores, key=lambda x: x["points"], top_n=top_n)
+            ],
+            "OneWeekHighestScoreAgainstPool": [
+                {
+                    "week": match["week"],
+                    "matchup_id": match["matchup_id"],
+                    "roster_id": match["matchup_loser"],
+                    "score": match["winner_points"],
+                    "opponent_id": match["matchup_winner"],
+                }
+                for match in Stats.rank(losses, key=lambda x: x["winner_points"], top_n=top_n)
+            ],
+            "OneWeekHighestScoringPlayerPool": Stats.rank(
+                weekly_player_scores, key=lambda x: x["score"], top_n=top_n
+            ),
+            "OneWeekSmallestMarginPool": [
+                {
+                    "week": match["week"],
+                    "matchup_id": match["matchup_id"],
+                    "roster_id": match["matchup_loser"],
+                    "score": match["matchup_margin"],
+                    "opponent_id": match["matchup_winner"],
+                }
+                for match in Stats.rank(
+                    losses, key=lambda x: x["matchup_margin"], top_n=top_n, reverse=False
+                )
+            ],
+        }
+
+    def leaderboard(self, pool_class):
+        """
+        Gets the leaderboard of a season pool.
+
+        Args:
+            pool_class (str): The class name of the season pool.
+
+        Returns:
+            list: Copies of the leaderboard entries in rank order, safe for the caller to modify.
+        """
+        return [dict(entry) for entry in self.leaderboards[pool_class]]
+
+    def winner(self, pool_class):
+        """
+        Gets the winner of a season pool.
+
+        Args:
+            pool_class (str): The class name of the season pool.
+
+        Returns:
+            list: The top leaderboard entry, or an empty list if the leaderboard is empty.
+        """
+        return self.leaderboard(pool_class)[:1]
@@ -0,0 +1,99 @@
+"""
+Settlement Module
+=================
+
+The Settlement module closes out the pools of a league for a given week.
+
+Every unpaid pool due that week is evaluated once, and all winners and winner payloads are
+written with a single bulk update in one transaction. If any pool fails to evaluate or the
+update fails, nothing is written, so a week is never left half settled.
+
+Functions:
+    settle_week: Settles every pool of a league due in a week.
+"""
+
+import logging
+
+from sqlalchemy import bindparam, update
+
+from ..database import session_scope
+from .pool import Pool
+from .user import User
+from .generation import LeagueGeneration
+
+
+def settle_week(league, week):
+    """
+    Settles every unpaid pool of a league due in a week.
+
+    Prop pools are skipped, since their winners are entered by hand. Special week pools pay every
+    matchup winner, so each is split into one pool per winner, which are then settled in the
+    same transaction.
+
+    Args:
+        league (League): The league to settle. Its stats are synced first if they have not been fetched.
+        week (int): The week to settle.
+
+    Returns:
+        dict: A mapping of pool ID to the username of its winner.
+    """
+    if not hasattr(league, "head_to_head"):
+        league.fetch_stats(incremental=True)
+
+    try:
+        with session_scope() as db:
+            pools = (
+                db.query(Pool)
+                .filter(Pool.league_id == league.league_id, Pool.week == week)
+                .filter(Pool.paid.is_not(True))
+                .all()
+            )
+            # Winners are written by the bulk update below, not by flushing the loaded pools.
+            db.expunge_all()
+            users = User.get_users_by_roster_id(league.league_id)
+
+            due = []
+            for pool in pools:
+                if pool.pool_subtype == "prop":
+                    continue
+                pool.league = league
+                if pool.pool_subtype == "special_week" and pool.matchup_id is None:
+                    due.extend(pool.split_pool(db))
+                else:
+                    due.append(pool)
+
+            settled = []
+            for pool in due:
+                roster_id, payload = pool.evaluate()
+                user = users.get(int(roster_id))
+                if user is None:
+                    raise ValueError(
+                        f"User with roster_id {roster_id} not found in league {league.league_id}"
+                    )
+                settled.append(
+                    {
+                        "b_pool_id": pool.pool_id,
+                        "b_league_id": pool.league_id,
+                        "b_winner": user.username,
+                        "b_winner_payload": payload,
+                    }
+                )
+
+            if settled:
+                pools_table = Pool.__table__
+                stmt = (
+                    update(pools_table)
+                    .where(pools_table.c.pool_id == bindparam("b_pool_id"))
+                    .where(pools_table.c.league_id == bindparam("b_league_id"))
+                    .values(
+                        winner=bindparam("b_winner"),
+                        winner_payload=bindparam("b_winner_payload"),
+                    )
+                )
+                db.execute(stmt, settled)
+                LeagueGeneration.bump(db, league.league_id)
+    except Exception as e:
+        logging.error(f"Failed to settle week {week} of league {league.league_id}: {e}")
+        raise
+
+    return {row["b_pool_id"]: row["b_winner"] for row in settled}
@@ -0,0 +1,337 @@
+"""
+Sleeper Cache Module
+====================
+
+The Sleeper Cache module provides an on-disk cache for Sleeper API responses.
+
+Responses that can no longer change, such as completed weeks and past seasons, are stored
+permanently. Live responses, such as the in-progress week and the NFL state, are kept for a
+short TTL before they are requested again.
+
+The state persisted by league syncs is kept apart from the responses, under `SYNC_DIR`, so
+invalidating cached responses never discards a sync.
+
+Classes:
+    SleeperCache: A cache for the Sleeper league endpoints used by the League model.
+    RosterCache: A roster cache shared by every League and User call within one sync run.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sleeperpy import Leagues
+
+
+class SleeperCache:
+    """
+    A cache for the Sleeper league endpoints used by the League model.
+
+    Every method mirrors the matching `sleeperpy.Leagues` call. Methods taking a `final` flag
+    store the response permanently when it is True and for `LIVE_TTL` seconds otherwise.
+    """
+
+    CACHE_DIR = os.environ.get("SLEEPER_CACHE_DIR", ".cache/sleeper")
+    SYNC_DIR = os.environ.get("SLEEPER_SYNC_DIR", ".cache/sync")
+    LIVE_TTL = 300
+    STATE_TTL = 300
+
+    @classmethod
+    def _path(cls, *key):
+        """
+        Builds the file path for a cache key.
+
+        Args:
+            *key: The parts of the cache key.
+
+        Returns:
+            str: The path of the cache file.
+        """
+        return os.path.join(cls.CACHE_DIR, *[str(part) for part in key]) + ".json"
+
+    @classmethod
+    def _read(cls, path, stale=False):
+        """
+        Reads a cache entry if it exists and has not expired.
+
+        Args:
+            path (str): The path of the cache file.
+            stale (bool): Whether to return the entry even if it has expired (default: False).
+
+        Returns:
+            The cached response, or None if the entry is missing or expired.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if stale:
+            return entry["data"]
+        if entry["ttl"] is not None and time.time() - entry["fetched_at"] > entry["ttl"]:
+            return None
+        return entry["data"]
+
+    @classmethod
+    def _write(cls, path, data, ttl):
+        """
+        Writes a cache entry atomically so concurrent readers never see a partial file.
+
+        Args:
+            path (str): The path of the cache file.
+            data: The response to store.
+            ttl (int): The number of seconds the entry stays fresh, or None to keep it permanently.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump({"fetched_at": time.time(), "ttl": ttl, "data": data}, file)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, key, stale=False):
+        """
+        Reads a cache entry without falling back to Sleeper.
+
+        Args:
+            key (tuple): The parts of the cache key.
+            stale (bool): Whether to return the entry even if it has expired (default: False).
+
+        Returns:
+            The cached data, or None if the entry is missing or expired.
+        """
+        return cls._read(cls._path(*key), stale)
+
+    @classmethod
+    def store(cls, key, data, ttl=None):
+        """
+        Writes a cache entry.
+
+        Args:
+            key (tuple): The parts of the cache key.
+            data: The data to store. Must be JSON serializable.
+            ttl (int): The number of seconds the entry stays fresh, or None to keep it permanently.
+        """
+        cls._write(cls._path(*key), data, ttl)
+
+    @classmethod
+    def load_sync_state(cls, league_id):
+        """
+        Reads the state persisted by the last sync of a league.
+
+        State written by earlier versions inside the response cache is read as a fallback.
+
+        Args:
+            league_id (str): The ID of the league.
+
+        Returns:
+            dict: The sync state, or None if the league has never been synced.
+        """
+        state = cls._read(os.path.join(cls.SYNC_DIR, f"{league_id}.json"))
+        if state is None:
+            state = cls.load(("leagues", league_id, "sync"))
+        return state
+
+    @classmethod
+    def store_sync_state(cls, league_id, state):
+        """
+        Persists the state of a league sync. It is kept until the next sync replaces it.
+
+        Args:
+            league_id (str): The ID of the league.
+            state (dict): The sync state. Must be JSON serializable.
+        """
+        cls._write(os.path.join(cls.SYNC_DIR, f"{league_id}.json"), state, None)
+
+    @classmethod
+    def fetch(cls, key, loader, ttl=None, refresh=False):
+        """
+        Returns the cached response for a key, calling the loader on a miss.
+
+        Empty responses are returned but not stored. sleeperpy returns None on errors, and an
+        empty list can be a transient response, which must not be cached for a final week.
+
+        Args:
+            key (tuple): The parts of the cache key.
+            loader (callable): A function that requests the response from Sleeper.
+            ttl (int): The number of seconds the entry stays fresh, or None to keep it permanently.
+            refresh (bool): Whether to skip the cached entry and request it again (default: False).
+
+        Returns:
+            The cached or freshly requested response.
+        """
+        path = cls._path(*key)
+        data = None if refresh else cls._read(path)
+        if data is None:
+            data = loader()
+            if data:
+                cls._write(path, data, ttl)
+        return data
+
+    @classmethod
+    def invalidate(cls, league_id=None, week=None):
+        """
+        Removes cached responses. Sync state is kept.
+
+        Args:
+            league_id (str): The league to invalidate. If None, the whole cache is cleared.
+            week (int): The matchup week to invalidate. If None, every response for the league is removed.
+        """
+        if league_id is None:
+            shutil.rmtree(cls.CACHE_DIR, ignore_errors=True)
+        elif week is None:
+            shutil.rmtree(os.path.join(cls.CACHE_DIR, "leagues", str(league_id)), ignore_errors=True)
+        else:
+            try:
+                os.remove(cls._path("leagues", league_id, "matchups", week))
+            except FileNotFoundError:
+                pass
+
+    @classmethod
+    def get_state(cls, sport="nfl"):
+        """
+        Gets the current state of the sport, refreshed every `STATE_TTL` seconds.
+        """
+        return cls.fetch(("state", sport), lambda: Leagues.get_state(sport), cls.STATE_TTL)
+
+    @classmethod
+    def get_all_leagues(cls, user_id, sport, season, final=False):
+        """
+        Gets every league of a user for the given season.
+        """
+        return cls.fetch(
+            ("users", user_id, f"{sport}_{season}"),
+            lambda: Leagues.get_all_leagues(user_id, sport, season),
+            None if final else cls.LIVE_TTL,
+        )
+
+    @classmethod
+    def get_league(cls, league_id, final=False):
+        """
+        Gets the settings of a league.
+        """
+        return cls.fetch(
+            ("leagues", league_id, "league"),
+            lambda: Leagues.get_league(league_id),
+            None if final else cls.LIVE_TTL,
+        )
+
+    @classmethod
+    def get_rosters(cls, league_id, final=False, refresh=False):
+        """
+        Gets the rosters of a league.
+        """
+        return cls.fetch(
+            ("leagues", league_id, "rosters"),
+            lambda: Leagues.get_rosters(league_id),
+            None if final else cls.LIVE_TTL,
+            refresh,
+        )
+
+    @classmethod
+    def get_users(cls, league_id, final=False, refresh=False):
+        """
+        Gets the users of a league.
+        """
+        return cls.fetch(
+            ("leagues", league_id, "users"),
+            lambda: Leagues.get_users(league_id),
+            None if final else cls.LIVE_TTL,
+            refresh,
+        )
+
+    @classmethod
+    def get_matchups(cls, league_id, week, final=False):
+        """
+        Gets the matchups of a league for a week.
+        """
+        return cls.fetch(
+            ("leagues", league_id, "matchups", week),
+            lambda: Leagues.get_matchups(league_id, week),
+            None if final else cls.LIVE_TTL,
+        )
+
+    @classmethod
+    def get_winners_playoff_bracket(cls, league_id, final=False, refresh=False):
+        """
+        Gets the winners playoff bracket of a league.
+
+        The bracket is stored permanently once every match of its last round has a winner.
+        With `refresh`, the cached bracket is skipped and requested again.
+        """
+        key = ("leagues", league_id, "playoffs")
+        bracket = None if refresh else cls.load(key)
+        if bracket is None:
+            bracket = Leagues.get_winners_playoff_bracket(league_id)
+            if bracket:
+                final = final or cls._bracket_final(bracket)
+                cls.store(key, bracket, None if final else cls.LIVE_TTL)
+        return bracket
+
+    @staticmethod
+    def _bracket_final(bracket):
+        """
+        Checks whether every match in the last round of a playoff bracket has been decided.
+
+        Args:
+            bracket (list): The bracket matches, each with a round `r` and an optional winner `w`.
+
+        Returns:
+            bool: True if the last round is complete, False otherwise.
+        """
+        if not bracket:
+            return False
+        last_round = max(match["r"] for match in bracket)
+        return all(match.get("w") is not None for match in bracket if match["r"] == last_round)
+
+
+class RosterCache:
+    """
+    A roster cache shared by every League and User call within one sync run.
+
+    Inside `RosterCache.sync_run()` the rosters of each league are fetched once and reused by
+    every caller. Outside a sync run, `get` falls through to the SleeperCache.
+    """
+
+    _run = ContextVar("roster_sync_run", default=None)
+
+    @classmethod
+    @contextmanager
+    def sync_run(cls):
+        """
+        Scopes roster caching to a block. Nested runs share the outermost run's rosters.
+        """
+        if cls._run.get() is not None:
+            yield
+            return
+        token = cls._run.set({})
+        try:
+            yield
+        finally:
+            cls._run.reset(token)
+
+    @classmethod
+    def get(cls, league_id, final=False, refresh=False):
+        """
+        Gets the rosters of a league.
+
+        Args:
+            league_id (str): The ID of the league.
+            final (bool): Whether the rosters can no longer change (default: False).
+            refresh (bool): Whether to request the rosters from Sleeper again (default: False).
+
+        Returns:
+            list: The rosters of the league.
+        """
+        rosters = cls._run.get()
+        if rosters is None:
+            return SleeperCache.get_rosters(league_id, final=final, refresh=refresh)
+        if refresh or league_id not in rosters:
+            rosters[league_id] = SleeperCache.get_rosters(
+                league_id, final=final, refresh=refresh
+            )
+        return rosters[league_id]
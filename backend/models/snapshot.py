@@ -0,0 +1,155 @@
+"""
+Snapshot Module
+===============
+
+The Snapshot module stores materialized leaderboards of a league's season pools.
+
+Computing a leaderboard needs the league's synced data and a user lookup. Instead of doing that
+on every page view, `refresh_leaderboard_snapshots` runs after each sync and writes every season
+pool's ranked top-N rows to the `leaderboard_snapshots` table, keyed by league, pool and week.
+Reading a leaderboard is then a single SELECT on the table's primary key. The refresh is run
+by the sync job, `python -m backend.sync`. The table is created on first use, so reads before the
+first refresh find no snapshot and fall back to computing the leaderboard.
+
+Classes:
+    LeaderboardSnapshot: One ranked row of a season pool's leaderboard as of a week.
+
+Functions:
+    refresh_leaderboard_snapshots: Rewrites the snapshots of every season pool of a league.
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, Column, DateTime, Integer, String, delete, func, insert, select
+from sqlalchemy.ext.declarative import declarative_base
+
+from ..database import ensure_table, session_scope
+from .generation import LeagueGeneration
+
+Base = declarative_base()
+
+
+class LeaderboardSnapshot(Base):
+    """
+    One ranked row of a season pool's leaderboard as of a week.
+
+    The primary key (league_id, pool_id, week, position) doubles as the index every read uses.
+    """
+
+    __tablename__ = "leaderboard_snapshots"
+
+    league_id = Column(String, primary_key=True)
+    pool_id = Column(String, primary_key=True)
+    week = Column(Integer, primary_key=True)
+    position = Column(Integer, primary_key=True)
+    entry = Column(JSON)
+    refreshed_at = Column(DateTime(timezone=True))
+
+    @classmethod
+    def get_leaderboard(cls, league_id, pool_id, week=None):
+        """
+        Reads a pool's leaderboard from its snapshot.
+
+        Args:
+            league_id (str): The ID of the league.
+            pool_id (str): The ID of the pool.
+            week (int): The week of the snapshot. If None, the latest snapshot is read.
+
+        Returns:
+            list: The leaderboard entries in rank order, or None if no snapshot is stored.
+        """
+        query = (
+            select(cls.entry)
+            .where(cls.league_id == league_id, cls.pool_id == pool_id)
+            .order_by(cls.position)
+        )
+        if week is None:
+            latest = (
+                select(func.max(cls.week))
+                .where(cls.league_id == league_id, cls.pool_id == pool_id)
+                .scalar_subquery()
+            )
+            query = query.where(cls.week == latest)
+        else:
+            query = query.where(cls.week == week)
+
+        ensure_table(cls.__table__)
+        with session_scope() as db:
+            entries = list(db.execute(query).scalars())
+        return entries or None
+
+
+def refresh_leaderboard_snapshots(league):
+    """
+    Rewrites the leaderboard snapshots of every season pool of a league for its current week.
+
+    Leaderboards are computed from the league's season aggregate and written in one transaction,
+    so readers see either the previous or the new snapshots, never a mix. If they match the stored
+    snapshots nothing is written and the league's generation is not bumped, so page caches stay
+    valid across syncs that change nothing.
+
+    Args:
+        league (League): The League instance, with its stats synced.
+
+    Returns:
+        int: The number of snapshot rows written, or 0 if the snapshots are unchanged.
+    """
+    from .leaderboard import SEASON_SUBTYPES
+    from .pool import Pool
+
+    with session_scope() as db:
+        pools = (
+            db.query(Pool)
+            .filter(Pool.league_id == league.league_id)
+            .filter(Pool.pool_subtype.in_(SEASON_SUBTYPES))
+            .all()
+        )
+
+    refreshed_at = datetime.now(timezone.utc)
+    rows = []
+    for pool in pools:
+        pool.league = league
+        for position, entry in enumerate(pool.compute_leaderboard()):
+            rows.append(
+                {
+                    "league_id": league.league_id,
+                    "pool_id": pool.pool_id,
+                    "week": int(league.week),
+                    "position": position,
+                    "entry": entry,
+                    "refreshed_at": refreshed_at,
+                }
+            )
+
+    snapshots = LeaderboardSnapshot.__table__
+    ensure_table(snapshots)
+    # Entries are compared as they read back from the JSON column.
+    current = {
+        (row["pool_id"], row["position"]): json.loads(json.dumps(row["entry"])) for row in rows
+    }
+    try:
+        with session_scope() as db:
+            stored = {
+                (pool_id, position): entry
+                for pool_id, position, entry in db.execute(
+                    select(snapshots.c.pool_id, snapshots.c.position, snapshots.c.entry)
+                    .where(snapshots.c.league_id == league.league_id)
+                    .where(snapshots.c.week == int(league.week))
+                )
+            }
+            if stored == current:
+                return 0
+            db.execute(
+                delete(snapshots)
+                .where(snapshots.c.league_id == league.league_id)
+                .where(snapshots.c.week == int(league.week))
+            )
+            if rows:
+                db.execute(insert(snapshots), rows)
+            LeagueGeneration.bump(db, league.league_id)
+    except Exception as e:
+        logging.error(f"Failed to refresh leaderboard snapshots of league {league.league_id}: {e}")
+        raise
+    return len(rows)
@@ -4,6 +4,9 @@ Stats Module
 
 This module provides classes for retrieving statistics related to league matchups and player performances.
 
+The league's matchups, head-to-head results and player scores are held in WeekIndex stores, so
+week-filtered queries only read the rows of that week.
+
 Classes:
 - Stats: Abstract base class for retrieving statistics.
 - MatchupStats: Subclass of Stats for retrieving matchup statistics.
@@ -11,6 +14,7 @@ Classes:
 - LeagueStats: Subclass of Stats for retrieving league-wide statistics.
 """
 
+import heapq
 from abc import ABC
 
 
@@ -26,12 +30,49 @@ class Stats(ABC):
 
         Args:
             stats (list of dict): A list of matchups or stats.
-            optouts (set): A set of optout roster IDs.
+            league (League): The League instance, whose optout_ids mask is built once per sync.
+            key (str): The row key holding the roster ID to check. Default is 'roster_id'.
 
         Returns:
             list of dict: A filtered list of matchups or stats without teams that have opted out.
         """
-        return [x for x in stats if str(x.get(key)) not in league.optouts]
+        optout_ids = league.optout_ids
+        if not optout_ids:
+            return list(stats)
+        return [x for x in stats if x.get(key) not in optout_ids]
+
+    @staticmethod
+    def rank(rows, key, top_n=1, reverse=True, dense=False):
+        """
+        Selects the top N rows by a key using heap selection.
+
+        Runs in O(n log k) rather than sorting every row. Ties keep their input order, exactly
+        as a stable sort followed by a slice would.
+
+        Args:
+            rows (iterable): The rows to rank.
+            key (callable): A function returning the value to rank each row by.
+            top_n (int): The number of rows to return. Default is 1.
+            reverse (bool): Whether the highest values rank first. Default is True.
+            dense (bool): Whether to return copies of the rows with a dense "rank" added. Default is False.
+
+        Returns:
+            list: The top N rows in rank order.
+        """
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        top_rows = select(top_n, rows, key=key)
+        if not dense:
+            return top_rows
+
+        ranked = []
+        rank, previous = 0, object()
+        for row in top_rows:
+            value = key(row)
+            if value != previous:
+                rank += 1
+                previous = value
+            ranked.append(dict(row, rank=rank))
+        return ranked
 
 
 class MatchupStats(Stats):
@@ -49,6 +90,7 @@ class MatchupStats(Stats):
     def get_small_scoring_margin(league, week=None, top_n=1):
         """
         Gets the team with the smallest margin of loss for a specific week.
+        Tied matchups have no loser and are left out.
 
         Args:
             league (League): The League instance.
@@ -58,18 +100,11 @@ class MatchupStats(Stats):
         Returns:
             list: A list of dictionaries containing week, matchup_id, and matchup_margin.
         """
-        if week is not None:
-            head_to_head = [
-                match for match in league.head_to_head if match.get("week") == week
-            ]
-        else:
-            head_to_head = [
-                match for match in league.head_to_head
-            ]
+        head_to_head = [match for match in league.head_to_head.rows(week) if not match.get("tie")]
 
         eligible_margins = Stats.filter_out_optouts(head_to_head, league, 'matchup_loser')
-        sorted_margins = sorted(
-            eligible_margins, key=lambda x: x["matchup_margin"], reverse=False
+        sorted_margins = Stats.rank(
+            eligible_margins, key=lambda x: x["matchup_margin"], top_n=top_n, reverse=False
         )
         return [
             {
@@ -79,12 +114,13 @@ class MatchupStats(Stats):
                 "score": match["matchup_margin"],
                 "opponent_id": match["matchup_winner"],
             }
-            for match in sorted_margins[:top_n]
+            for match in sorted_margins
         ]
 
     def get_high_scoring_margin(league, week=None, top_n=1):
         """
         Finds the team(s) with the highest scoring margin for a specific week.
+        Tied matchups have no winner and are left out.
 
         Args:
             week (int): The week number to filter matchups. If None, all weeks are considered.
@@ -94,18 +130,11 @@ class MatchupStats(Stats):
             list: A list of dictionaries containing week, matchup_id, and matchup_margin.
         """
 
-        if week is not None:
-            head_to_head = [
-                match for match in league.head_to_head if match.get("week") == week
-            ]
-        else:
-            head_to_head = [
-                match for match in league.head_to_head
-            ]
+        head_to_head = [match for match in league.head_to_head.rows(week) if not match.get("tie")]
 
         eligible_margins = Stats.filter_out_optouts(head_to_head, league, 'matchup_winner')
-        sorted_margins = sorted(
-            eligible_margins, key=lambda x: x["matchup_margin"], reverse=True
+        sorted_margins = Stats.rank(
+            eligible_margins, key=lambda x: x["matchup_margin"], top_n=top_n
         )
         return [
             {
@@ -115,7 +144,7 @@ class MatchupStats(Stats):
                 "score": match["matchup_margin"],
                 "opponent_id": match["matchup_loser"],
             }
-            for match in sorted_margins[:top_n]
+            for match in sorted_margins
         ]
 
     def get_high_team_score(league, week=None, top_n=1):
@@ -130,23 +159,9 @@ class MatchupStats(Stats):
             List[dict]: A list of dictionaries containing information about the top N teams with the high score.
         """
 
-        all_team_scores = []
-        if week is None:
-            for week_num, week_matchups in league.matchups.items():
-                for matchup in week_matchups:
-                    matchup["week"] = week_num
-                eligible_matchups = Stats.filter_out_optouts(week_matchups, league)
-                all_team_scores.extend(eligible_matchups)
-        else:
-            week_matchups = league.matchups.get(week, [])
-            for matchup in week_matchups:
-                matchup["week"] = week  # Ensure "week" key is present
-            eligible_matchups = Stats.filter_out_optouts(week_matchups, league)
-            all_team_scores.extend(eligible_matchups)
-
-        top_teams = sorted(all_team_scores, key=lambda x: x["points"], reverse=True)[
-            :top_n
-        ]
+        all_team_scores = Stats.filter_out_optouts(league.matchups.rows(week), league)
+
+        top_teams = Stats.rank(all_team_scores, key=lambda x: x["points"], top_n=top_n)
         return [
             {
                 "week": team["week"],
@@ -161,6 +176,7 @@ class MatchupStats(Stats):
     def get_high_score_against(league, week=None, top_n=1):
         """
         Gets the team with the highest score against for a specific week.
+        Tied matchups have no loser and are left out.
 
         Args:
             week (int): The week number to filter matchups. If None, all weeks are considered.
@@ -170,16 +186,12 @@ class MatchupStats(Stats):
             list: A list of dictionaries containing week, matchup_id, and winner_points.
         """
 
-        if week is not None:
-            head_to_head = [match for match in league.head_to_head.get(week, [])]
-        else:
-            head_to_head = [match for match in league.head_to_head]
+        head_to_head = [match for match in league.head_to_head.rows(week) if not match.get("tie")]
 
         eligible_scores_against = Stats.filter_out_optouts(head_to_head, league, 'matchup_loser')
-        sorted_scores_against = sorted(
-            eligible_scores_against, key=lambda x: x["winner_points"], reverse=True
+        top_teams = Stats.rank(
+            eligible_scores_against, key=lambda x: x["winner_points"], top_n=top_n
         )
-        top_teams = sorted_scores_against[:top_n]
         return [
             {
                 "week": team["week"],
@@ -194,6 +206,7 @@ class MatchupStats(Stats):
     def get_head_to_head_winners(league, week=None, matchup_id=None):
         """
         Gets the roster IDs of the matchup winners for the specified week or all weeks if week is None.
+        Tied matchups have no winner and are left out.
 
         Args:
             week (int): The week number to filter matchups. If None, all weeks are considered.
@@ -203,50 +216,17 @@ class MatchupStats(Stats):
             List[dict]: A list of dictionaries containing roster IDs of the matchup winners.
         """
 
-        winners = []
-        if week is None and matchup_id is None:
-            winners = [
-                {
-                    "week": match["week"],
-                    "matchup_id": match["matchup_id"],
-                    "roster_id": match["matchup_winner"],
-                    "opponent_id": match["matchup_loser"],
-                }
-                for match in league.head_to_head
-            ]
-        elif week is not None and matchup_id is None:
-            winners = [
-                {
-                    "week": match["week"],
-                    "matchup_id": match["matchup_id"],
-                    "roster_id": match["matchup_winner"],
-                    "opponent_id": match["matchup_loser"],
-                }
-                for match in league.head_to_head
-                if match["week"] == week
-            ]
-        elif week is None and matchup_id is not None:
-            winners = [
-                {
-                    "week": match["week"],
-                    "matchup_id": match["matchup_id"],
-                    "roster_id": match["matchup_winner"],
-                    "opponent_id": match["matchup_loser"],
-                }
-                for match in league.head_to_head
-                if match["matchup_id"] == matchup_id
-            ]
-        else:
-            winners = [
-                {
-                    "week": match["week"],
-                    "matchup_id": match["matchup_id"],
-                    "roster_id": match["matchup_winner"],
-                    "opponent_id": match["matchup_loser"],
-                }
-                for match in league.head_to_head
-                if match["week"] == week and match["matchup_id"] == matchup_id
-            ]
+        winners = [
+            {
+                "week": match["week"],
+                "matchup_id": match["matchup_id"],
+                "roster_id": match["matchup_winner"],
+                "opponent_id": match["matchup_loser"],
+            }
+            for match in league.head_to_head.rows(week)
+            if not match.get("tie")
+            and (matchup_id is None or match["matchup_id"] == matchup_id)
+        ]
         winners_filtered = Stats.filter_out_optouts(winners, league)
         return winners_filtered
 
@@ -287,23 +267,13 @@ class PlayerStats(Stats):
             list: The list of top scoring players.
         """
         if week is None:
-            eligible_player_scores = Stats.filter_out_optouts(
-                [
-                    score
-                    for score in league.player_stats
-                    if score["week"] in league.REGULAR_SEASON
-                ],
-                league,
-            )
-
+            player_scores = league.player_stats.rows(weeks=league.REGULAR_SEASON)
         else:
-            eligible_player_scores = Stats.filter_out_optouts(
-                [score for score in league.player_stats if score["week"] == week],
-                league,
-            )
-        high_scoring_player = sorted(
-            eligible_player_scores, key=lambda x: x["score"], reverse=True
-        )[:top_n]
+            player_scores = league.player_stats.rows(week)
+        eligible_player_scores = Stats.filter_out_optouts(player_scores, league)
+        high_scoring_player = Stats.rank(
+            eligible_player_scores, key=lambda x: x["score"], top_n=top_n
+        )
         return high_scoring_player
 
     def get_regular_season_high_scoring_player(league, top_n=1):
@@ -318,16 +288,13 @@ class PlayerStats(Stats):
         """
         player_totals = {}
         player_info = {}
-        for player in league.player_stats:
+        for player in Stats.filter_out_optouts(league.player_stats, league):
             player_id = player["player_id"]
             score = player["score"]
             roster_id = player["roster_id"]
             position = player["position"]
             player_name = player["player_name"]
 
-            if not Stats.filter_out_optouts([player], league):
-                continue
-
             if player_id in player_totals:
                 player_totals[player_id] += score
             else:
@@ -341,8 +308,7 @@ class PlayerStats(Stats):
                 }
 
         top_players = []
-        sorted_player_ids = sorted(player_totals, key=player_totals.get, reverse=True)
-        for player_id in sorted_player_ids[:top_n]:
+        for player_id in Stats.rank(player_totals, key=player_totals.get, top_n=top_n):
             top_player_info = {
                 "player_id": player_id,
                 "score": player_totals[player_id],
@@ -375,17 +341,12 @@ class LeagueStats(Stats):
         Returns:
             list: A list of dictionaries containing information about the top rosters, including roster ID, total wins, and total points for.
         """
-        eligible_rosters = [
-            team
-            for team in league.team_stats
-            if team.get("roster_id") not in league.optouts
-        ]
-        sorted_rosters = sorted(
+        eligible_rosters = Stats.filter_out_optouts(league.team_stats, league)
+        top_teams = Stats.rank(
             eligible_rosters,
             key=lambda x: (x["total_wins"], x["total_points_for"]),
-            reverse=True,
+            top_n=top_n,
         )
-        top_teams = sorted_rosters[:top_n]
         return [team for team in top_teams]
 
     def get_regular_season_most_points(league, top_n=1):
@@ -400,10 +361,9 @@ class LeagueStats(Stats):
         """
 
         eligible_rosters = Stats.filter_out_optouts(league.team_stats, league)
-        sorted_rosters = sorted(
-            eligible_rosters, key=lambda x: x["total_points_for"], reverse=True
+        top_teams = Stats.rank(
+            eligible_rosters, key=lambda x: x["total_points_for"], top_n=top_n
         )
-        top_teams = sorted_rosters[:top_n]
         return [{"roster_id": team["roster_id"], "score": team["total_points_for"]} for team in top_teams]
 
     def get_regular_season_most_points_against(league, top_n=1):
@@ -418,8 +378,7 @@ class LeagueStats(Stats):
         """
         eligible_rosters = Stats.filter_out_optouts(league.team_stats, league)
 
-        sorted_rosters = sorted(
-            eligible_rosters, key=lambda x: x["total_points_against"], reverse=True
+        top_teams = Stats.rank(
+            eligible_rosters, key=lambda x: x["total_points_against"], top_n=top_n
         )
-        top_teams = sorted_rosters[:top_n]
         return [{"roster_id": team["roster_id"], "score": team["total_points_against"]} for team in top_teams]
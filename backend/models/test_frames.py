@@ -0,0 +1,200 @@
+import random
+import unittest
+
+from backend.models.frames import (
+    LeagueFrames,
+    FrameMatchupStats,
+    FramePlayerStats,
+    FrameLeagueStats,
+    derive_head_to_head,
+)
+from backend.models.stats import MatchupStats, PlayerStats, LeagueStats
+from backend.models.week_index import WeekIndex
+
+
+class FakeLeague:
+    """
+    A league with randomly generated stats, holding only what the stats methods read.
+    """
+
+    REGULAR_SEASON = list(range(1, 15))
+
+    def __init__(self, seed):
+        generator = random.Random(seed)
+        self.optout_ids = frozenset(generator.sample(range(1, 13), 2))
+
+        matchups = {}
+        for week in range(1, 18):
+            roster_ids = list(range(1, 13))
+            generator.shuffle(roster_ids)
+            # Few distinct scores, so ties are common. After the regular season only four
+            # teams are paired and the rest have no matchup.
+            matchups[week] = [
+                {
+                    "week": week,
+                    "matchup_id": i // 2 + 1 if week < 15 or i < 4 else None,
+                    "roster_id": roster_id,
+                    "points": float(generator.choice([95.5, 100, 110, 120])),
+                }
+                for i, roster_id in enumerate(roster_ids)
+            ]
+        self.matchups = WeekIndex(matchups)
+        self.head_to_head = WeekIndex.from_rows(derive_head_to_head(self.matchups))
+
+        self.player_stats = WeekIndex.from_rows(
+            {
+                "player_id": str(player_id),
+                "player_name": f"Player {player_id}",
+                "position": "QB",
+                "week": week,
+                "roster_id": roster_id,
+                "score": float(generator.randint(0, 10)),
+            }
+            for week in range(1, 18)
+            for roster_id in range(1, 13)
+            for player_id in generator.sample(range(40), 3)
+        )
+        self.team_stats = [
+            {
+                "roster_id": roster_id,
+                "total_wins": generator.randint(0, 3),
+                "total_losses": 1,
+                "total_ties": 0,
+                "total_points_for": float(generator.randint(1000, 1003)),
+                "total_points_against": float(generator.randint(1000, 1003)),
+            }
+            for roster_id in range(1, 13)
+        ]
+        self.frames = LeagueFrames.from_league(self)
+
+
+class TestDeriveHeadToHead(unittest.TestCase):
+    def test_winner_and_loser(self):
+        rows = derive_head_to_head(
+            [
+                {"week": 1, "matchup_id": 1, "roster_id": 1, "points": 90.0},
+                {"week": 1, "matchup_id": 1, "roster_id": 2, "points": 100.5},
+            ]
+        )
+        self.assertEqual(
+            rows,
+            [
+                {
+                    "week": 1,
+                    "matchup_id": 1,
+                    "matchup_winner": 2,
+                    "matchup_loser": 1,
+                    "winner_points": 100.5,
+                    "loser_points": 90.0,
+                    "matchup_margin": 10.5,
+                    "tie": False,
+                }
+            ],
+        )
+
+    def test_tie_records_first_team_as_winner(self):
+        rows = derive_head_to_head(
+            [
+                {"week": 1, "matchup_id": 1, "roster_id": 4, "points": 100.0},
+                {"week": 1, "matchup_id": 1, "roster_id": 3, "points": 100.0},
+            ]
+        )
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]["matchup_winner"], rows[0]["matchup_loser"]), (4, 3))
+        self.assertEqual(rows[0]["matchup_margin"], 0)
+        self.assertTrue(rows[0]["tie"])
+
+    def test_byes_and_unpaired_matchups_are_left_out(self):
+        rows = derive_head_to_head(
+            [
+                {"week": 15, "matchup_id": None, "roster_id": 1, "points": 120.0},
+                {"week": 15, "matchup_id": 1, "roster_id": 2, "points": 110.0},
+                {"week": 15, "matchup_id": 2, "roster_id": 3, "points": 100.0},
+                {"week": 15, "matchup_id": 2, "roster_id": 4, "points": 90.0},
+                {"week": 15, "matchup_id": 3, "roster_id": 5, "points": 80.0},
+                {"week": 15, "matchup_id": 3, "roster_id": 6, "points": 70.0},
+                {"week": 15, "matchup_id": 3, "roster_id": 7, "points": 60.0},
+            ]
+        )
+        self.assertEqual([(x["matchup_id"], x["matchup_winner"]) for x in rows], [(2, 3)])
+
+    def test_rows_are_in_week_then_matchup_order(self):
+        rows = derive_head_to_head(
+            [
+                {"week": 2, "matchup_id": 1, "roster_id": 1, "points": 1.0},
+                {"week": 1, "matchup_id": 2, "roster_id": 1, "points": 1.0},
+                {"week": 2, "matchup_id": 1, "roster_id": 2, "points": 2.0},
+                {"week": 1, "matchup_id": 1, "roster_id": 3, "points": 1.0},
+                {"week": 1, "matchup_id": 2, "roster_id": 2, "points": 2.0},
+                {"week": 1, "matchup_id": 1, "roster_id": 4, "points": 2.0},
+            ]
+        )
+        self.assertEqual([(x["week"], x["matchup_id"]) for x in rows], [(1, 2), (1, 1), (2, 1)])
+
+    def test_no_matchups(self):
+        self.assertEqual(derive_head_to_head([]), [])
+
+
+class TestFrameStats(unittest.TestCase):
+    def setUp(self):
+        self.leagues = [FakeLeague(seed) for seed in range(10)]
+
+    def test_matchup_stats_match(self):
+        for league in self.leagues:
+            for week in (None, 1, 8, 16):
+                for top_n in (1, 12):
+                    for name in (
+                        "get_small_scoring_margin",
+                        "get_high_scoring_margin",
+                        "get_high_team_score",
+                        "get_high_score_against",
+                    ):
+                        with self.subTest(name=name, week=week, top_n=top_n):
+                            self.assertEqual(
+                                getattr(FrameMatchupStats, name)(league, week=week, top_n=top_n),
+                                getattr(MatchupStats, name)(league, week=week, top_n=top_n),
+                            )
+                with self.subTest(name="get_head_to_head_winners", week=week):
+                    self.assertEqual(
+                        FrameMatchupStats.get_head_to_head_winners(league, week=week),
+                        MatchupStats.get_head_to_head_winners(league, week=week),
+                    )
+
+    def test_player_stats_match(self):
+        for league in self.leagues:
+            for top_n in (1, 12):
+                for week in (None, 1, 16):
+                    with self.subTest(week=week, top_n=top_n):
+                        self.assertEqual(
+                            FramePlayerStats.get_high_player_score(league, week=week, top_n=top_n),
+                            PlayerStats.get_high_player_score(league, week=week, top_n=top_n),
+                        )
+                self.assertEqual(
+                    FramePlayerStats.get_regular_season_high_scoring_player(league, top_n=top_n),
+                    PlayerStats.get_regular_season_high_scoring_player(league, top_n=top_n),
+                )
+
+    def test_league_stats_match(self):
+        for league in self.leagues:
+            for top_n in (1, 12):
+                for name in (
+                    "get_regular_season_first_place",
+                    "get_regular_season_most_points",
+                    "get_regular_season_most_points_against",
+                ):
+                    with self.subTest(name=name, top_n=top_n):
+                        self.assertEqual(
+                            getattr(FrameLeagueStats, name)(league, top_n=top_n),
+                            getattr(LeagueStats, name)(league, top_n=top_n),
+                        )
+
+    def test_optouts_are_left_out(self):
+        league = self.leagues[0]
+        rows = FrameMatchupStats.get_high_team_score(league, top_n=500)
+        self.assertEqual(len(rows), 10 * 17)
+        for row in rows:
+            self.assertNotIn(row["roster_id"], league.optout_ids)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from backend.models.result_cache import SQLiteResultCache
+
+VALUE = b"x" * 100
+VALUE_SIZE = len(pickle.dumps(VALUE, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class TestSQLiteResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = SQLiteResultCache(
+            os.path.join(self.directory, "results.sqlite"), max_bytes=3 * VALUE_SIZE
+        )
+        self.now = 1000.0
+        clock = patch("backend.models.result_cache.time.time", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def fill(self, *keys):
+        for key in keys:
+            self.now += 1
+            self.cache.set(key, VALUE)
+
+    def cached(self, *keys):
+        return [key for key in keys if self.cache.get(key)[0]]
+
+    def test_get_and_miss(self):
+        self.cache.set(("pool", 1), {"winner": 3})
+        self.assertEqual(self.cache.get(("pool", 1)), (True, {"winner": 3}))
+        self.assertEqual(self.cache.get(("pool", 2)), (False, None))
+
+    def test_evicts_least_recently_set(self):
+        self.fill("a", "b", "c", "d")
+        self.assertEqual(self.cached("a", "b", "c", "d"), ["b", "c", "d"])
+
+    def test_read_refreshes_stale_entry(self):
+        self.fill("a", "b", "c")
+        self.now += SQLiteResultCache.TOUCH_INTERVAL + 1
+        self.cache.get("a")
+        self.fill("d")
+        self.assertEqual(self.cached("a", "b", "c", "d"), ["a", "c", "d"])
+
+    def test_read_within_touch_interval_keeps_access_time(self):
+        self.fill("a", "b", "c")
+        self.cache.get("a")
+        self.fill("d")
+        self.assertEqual(self.cached("a", "b", "c", "d"), ["b", "c", "d"])
+
+    def test_value_larger_than_cache_is_not_stored(self):
+        self.cache.set("big", b"x" * (4 * VALUE_SIZE))
+        self.assertEqual(self.cache.get("big"), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
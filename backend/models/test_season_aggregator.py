@@ -0,0 +1,44 @@
+import unittest
+
+from backend.models.season_aggregator import SeasonAggregator
+from backend.models.stats import MatchupStats, PlayerStats, LeagueStats
+from backend.models.test_frames import FakeLeague
+
+
+class TestSeasonAggregator(unittest.TestCase):
+    def setUp(self):
+        self.leagues = [FakeLeague(seed) for seed in range(10)]
+
+    def expected(self, league, top_n):
+        return {
+            "RegularSeasonFirstPlacePool": LeagueStats.get_regular_season_first_place(league, top_n),
+            "RegularSeasonMostPointsPool": LeagueStats.get_regular_season_most_points(league, top_n),
+            "RegularSeasonMostPointsAgainstPool": LeagueStats.get_regular_season_most_points_against(
+                league, top_n
+            ),
+            "RegularSeasonHighestScoringPlayerPool": PlayerStats.get_regular_season_high_scoring_player(
+                league, top_n
+            ),
+            "OneWeekHighestScorePool": MatchupStats.get_high_team_score(league, None, top_n),
+            "OneWeekHighestScoreAgainstPool": MatchupStats.get_high_score_against(league, None, top_n),
+            "OneWeekHighestScoringPlayerPool": PlayerStats.get_high_player_score(league, None, top_n),
+            "OneWeekSmallestMarginPool": MatchupStats.get_small_scoring_margin(league, None, top_n),
+        }
+
+    def test_leaderboards_match_stats(self):
+        for league in self.leagues:
+            for top_n in (1, SeasonAggregator.LEADERBOARD_SIZE):
+                aggregator = SeasonAggregator(league, top_n=top_n)
+                for pool_class, expected in self.expected(league, top_n).items():
+                    with self.subTest(pool_class=pool_class, top_n=top_n):
+                        self.assertEqual(aggregator.leaderboard(pool_class), expected)
+                        self.assertEqual(aggregator.winner(pool_class), expected[:1])
+
+    def test_leaderboard_returns_copies(self):
+        aggregator = SeasonAggregator(self.leagues[0])
+        aggregator.leaderboard("OneWeekHighestScorePool")[0]["score"] = -1
+        self.assertNotEqual(aggregator.leaderboard("OneWeekHighestScorePool")[0]["score"], -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
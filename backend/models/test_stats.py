@@ -0,0 +1,43 @@
+import random
+import unittest
+
+from backend.models.stats import Stats
+
+
+class TestStatsRank(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            {"roster_id": 1, "points": 100.0},
+            {"roster_id": 2, "points": 120.0},
+            {"roster_id": 3, "points": 100.0},
+            {"roster_id": 4, "points": 120.0},
+            {"roster_id": 5, "points": 90.0},
+        ]
+        self.key = lambda x: x["points"]
+
+    def test_ties_keep_input_order(self):
+        top = Stats.rank(self.rows, key=self.key, top_n=4)
+        self.assertEqual([x["roster_id"] for x in top], [2, 4, 1, 3])
+
+    def test_ascending_ties_keep_input_order(self):
+        top = Stats.rank(self.rows, key=self.key, top_n=3, reverse=False)
+        self.assertEqual([x["roster_id"] for x in top], [5, 1, 3])
+
+    def test_matches_stable_sort(self):
+        generator = random.Random(0)
+        rows = [{"roster_id": i, "points": generator.randint(0, 5)} for i in range(50)]
+        for top_n in (1, 7, 50, 100):
+            for reverse in (True, False):
+                expected = sorted(rows, key=self.key, reverse=reverse)[:top_n]
+                self.assertEqual(
+                    Stats.rank(rows, key=self.key, top_n=top_n, reverse=reverse), expected
+                )
+
+    def test_dense_rank(self):
+        top = Stats.rank(self.rows, key=self.key, top_n=5, dense=True)
+        self.assertEqual([x["rank"] for x in top], [1, 1, 2, 2, 3])
+        self.assertNotIn("rank", self.rows[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from backend.models.week_index import WeekIndex
+
+
+class TestWeekIndex(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            {"week": 2, "roster_id": 1},
+            {"week": 1, "roster_id": 1},
+            {"week": 2, "roster_id": 2},
+            {"week": 1, "roster_id": 2},
+        ]
+        self.index = WeekIndex.from_rows(self.rows)
+
+    def test_from_rows_groups_by_week(self):
+        self.assertEqual(self.index.weeks(), [1, 2])
+        self.assertEqual(self.index.rows(week=1), [self.rows[1], self.rows[3]])
+        self.assertEqual(self.index.rows(week=2), [self.rows[0], self.rows[2]])
+
+    def test_iterates_rows_in_week_order(self):
+        self.assertEqual(list(self.index), [self.rows[1], self.rows[3], self.rows[0], self.rows[2]])
+        self.assertEqual(len(self.index), 4)
+
+    def test_rows_of_missing_week_is_empty(self):
+        self.assertEqual(self.index.rows(week=5), [])
+        self.assertNotIn(5, self.index)
+
+    def test_rows_of_several_weeks(self):
+        self.assertEqual(self.index.rows(weeks=[2, 5]), [self.rows[0], self.rows[2]])
+        self.assertEqual(self.index.rows(), list(self.index))
+
+    def test_set_week_keeps_weeks_sorted(self):
+        self.index.set_week("0", [{"week": 0, "roster_id": 3}])
+        self.assertEqual(self.index.weeks(), [0, 1, 2])
+        self.assertIn(0, self.index)
+
+    def test_set_week_replaces_rows(self):
+        self.index.set_week(1, [{"week": 1, "roster_id": 9}])
+        self.assertEqual(self.index.rows(week=1), [{"week": 1, "roster_id": 9}])
+        self.assertEqual(len(self.index), 3)
+
+    def test_drop_weeks(self):
+        self.index.drop_weeks([1, 7])
+        self.assertEqual(self.index.weeks(), [2])
+        self.assertEqual(self.index.to_dict(), {2: [self.rows[0], self.rows[2]]})
+
+
+if __name__ == '__main__':
+    unittest.main()
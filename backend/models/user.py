@@ -1,13 +1,14 @@
 from typing import Dict
 import yaml
-from sleeperpy import Leagues
 import logging
 
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, tuple_
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.declarative import declarative_base
-from ..database import get_db
+from ..database import session_scope
+from .sleeper_cache import SleeperCache, RosterCache
+from .generation import LeagueGeneration
 
 Base = declarative_base()
 
@@ -62,7 +63,8 @@ class User(Base):
         self.avatar = user_data["avatar"]
         self.venmo_id = User.venmo_ids.get(self.username, "")
         self.league_id = league_id
-        self.roster_id = self.set_roster(self.league_id)
+        self.roster = self.set_roster(self.league_id)
+        self.roster_id = self.roster.roster_id if self.roster else None
         self.save_to_database()
 
     def __str__(self):
@@ -84,17 +86,21 @@ class User(Base):
             "rosters": [roster.to_dict() for roster in self.rosters],
         }
 
-    def set_roster(self, league_id):
+    def set_roster(self, league_id, refresh=False):
         """
-        Finds and returns the roster ID for the user in the specified league.
+        Finds and returns the roster for the user in the specified league.
+
+        Rosters come from the RosterCache, so users built within one sync run share a single
+        roster request per league.
 
         Args:
             league_id (str): The league ID to search for.
+            refresh (bool): Whether to request the league's rosters from Sleeper again (default: False).
 
         Returns:
-            str: The user's roster ID in the given league, or None if not found.
+            Roster: The user's roster in the given league, or None if not found.
         """
-        rosters = Leagues.get_rosters(league_id)
+        rosters = RosterCache.get(league_id, refresh=refresh)
         for roster in rosters:
             if roster["owner_id"] == self.user_id:
                 roster = Roster(
@@ -122,30 +128,106 @@ class User(Base):
                     'username': self.username,
                 }
             )
-            db.session.execute(stmt)
-            self.roster = self.set_roster(self.league_id)
-            try:
-                self.roster_id = self.roster.roster_id
-            except:
-                self.roster_id = None
-
-            existing_roster = Roster.query.get((self.username, self.league_id))
-            if existing_roster:
-                pass
-            else:
-                db.session.add(Roster(
-                    username=self.username,
-                    league_id=self.league_id,
-                    roster_id=self.roster_id  # Assuming set_roster_id sets this
-                ))
-
-            db.session.commit()
+            with session_scope() as db:
+                db.execute(stmt)
+
+                existing_roster = db.get(Roster, (self.username, self.league_id))
+                if existing_roster:
+                    pass
+                else:
+                    db.add(Roster(
+                        username=self.username,
+                        league_id=self.league_id,
+                        roster_id=self.roster_id  # Assuming set_roster_id sets this
+                    ))
+                LeagueGeneration.bump(db, self.league_id)
 
         except Exception as e:
-            db.session.rollback()
             logging.error(f"Failed to add user to database: {e}")
             raise
 
+    @classmethod
+    def sync_league_members(cls, league_id, refresh=False):
+        """
+        Upserts every user and roster of a league in a single transaction.
+
+        Users and rosters are each written with one multi-row `INSERT ... ON CONFLICT` statement.
+        Conflicting rows are only updated when their content differs from the stored row, so
+        unchanged users and rosters are skipped by the database, and the league's generation is
+        only bumped when a row changed.
+
+        Args:
+            league_id (str): The league ID to sync.
+            refresh (bool): Whether to request the league's users and rosters from Sleeper again (default: False).
+
+        Returns:
+            list: The usernames of the synced users.
+        """
+        with RosterCache.sync_run():
+            league_users = SleeperCache.get_users(league_id, refresh=refresh)
+            rosters = RosterCache.get(league_id, refresh=refresh)
+        roster_ids = {roster["owner_id"]: roster["roster_id"] for roster in rosters}
+
+        user_rows = {}
+        roster_rows = []
+        for user_data in league_users:
+            username = user_data.get("username", user_data.get("display_name"))
+            user_rows[username] = {
+                "user_id": user_data["user_id"],
+                "username": username,
+                "avatar": user_data["avatar"],
+                "venmo_id": cls.venmo_ids.get(username, ""),
+            }
+            if user_data["user_id"] in roster_ids:
+                roster_rows.append(
+                    {
+                        "username": username,
+                        "league_id": league_id,
+                        "roster_id": roster_ids[user_data["user_id"]],
+                    }
+                )
+        if not user_rows:
+            return []
+
+        user_stmt = insert(User).values(list(user_rows.values()))
+        user_stmt = user_stmt.on_conflict_do_update(
+            index_elements=["username"],
+            set_={
+                "avatar": user_stmt.excluded.avatar,
+                "venmo_id": user_stmt.excluded.venmo_id,
+            },
+            where=tuple_(User.avatar, User.venmo_id).is_distinct_from(
+                tuple_(user_stmt.excluded.avatar, user_stmt.excluded.venmo_id)
+            ),
+        )
+
+        try:
+            with session_scope() as db:
+                # rowcount of an INSERT is only kept when asked for.
+                changed = db.execute(
+                    user_stmt.execution_options(preserve_rowcount=True)
+                ).rowcount
+                if roster_rows:
+                    roster_stmt = insert(Roster).values(roster_rows)
+                    roster_stmt = roster_stmt.on_conflict_do_update(
+                        index_elements=["username", "league_id"],
+                        set_={"roster_id": roster_stmt.excluded.roster_id},
+                        where=Roster.roster_id.is_distinct_from(
+                            roster_stmt.excluded.roster_id
+                        ),
+                    )
+                    changed += db.execute(
+                        roster_stmt.execution_options(preserve_rowcount=True)
+                    ).rowcount
+                # Skipped rows are not counted, so an unchanged league keeps its generation.
+                if changed:
+                    LeagueGeneration.bump(db, league_id)
+        except Exception as e:
+            logging.error(f"Failed to sync league members to database: {e}")
+            raise
+
+        return list(user_rows)
+
     @classmethod
     def get_user_by_roster_id(cls, roster_id, league_id):
         """
@@ -158,13 +240,33 @@ class User(Base):
         Returns:
             User: The user object if found, otherwise None.
         """
-        db = next(get_db())
-        query = (
-            db.query(User).join(Roster, User.username == Roster.username)
-            .filter(Roster.league_id == league_id, Roster.roster_id == roster_id)
-            .first()
-        )
+        with session_scope() as db:
+            query = (
+                db.query(User).join(Roster, User.username == Roster.username)
+                .filter(Roster.league_id == league_id, Roster.roster_id == roster_id)
+                .first()
+            )
 
         return query
 
-    
\ No newline at end of file
+    
+
+    @classmethod
+    def get_users_by_roster_id(cls, league_id):
+        """
+        Fetches every user in a league keyed by their roster ID, in a single query.
+
+        Args:
+            league_id (str): The league ID to search for.
+
+        Returns:
+            dict: A mapping of roster ID to User object.
+        """
+        with session_scope() as db:
+            rows = (
+                db.query(Roster.roster_id, User)
+                .join(User, User.username == Roster.username)
+                .filter(Roster.league_id == league_id)
+                .all()
+            )
+        return {roster_id: user for roster_id, user in rows}
@@ -0,0 +1,127 @@
+"""
+Week Index Module
+=================
+
+The Week Index module provides a week-indexed store for a league's matchups and derived rows.
+
+Stats methods query a single week in O(rows in that week) instead of scanning the whole season,
+and incremental syncs replace individual weeks without touching the rest.
+
+Classes:
+    WeekIndex: Rows of league data grouped by week.
+"""
+
+from itertools import chain
+
+
+class WeekIndex:
+    """
+    Rows of league data grouped by week.
+
+    Iterating a WeekIndex yields every row in week order, so it can be used wherever a flat list
+    of rows was expected.
+    """
+
+    def __init__(self, rows_by_week=None):
+        """
+        Initializes a WeekIndex.
+
+        Args:
+            rows_by_week (dict): A mapping of week number to the rows for that week (default: None).
+        """
+        self._weeks = {}
+        for week, rows in (rows_by_week or {}).items():
+            self.set_week(week, rows)
+
+    @classmethod
+    def from_rows(cls, rows, key="week"):
+        """
+        Builds a WeekIndex by grouping rows on their week.
+
+        Args:
+            rows (list): The rows to group.
+            key (str): The row key holding the week number (default: "week").
+
+        Returns:
+            WeekIndex: The grouped rows.
+        """
+        rows_by_week = {}
+        for row in rows:
+            rows_by_week.setdefault(row[key], []).append(row)
+        return cls(rows_by_week)
+
+    def set_week(self, week, rows):
+        """
+        Replaces the rows for a week.
+
+        Args:
+            week (int): The week number.
+            rows (list): The rows for the week.
+        """
+        week = int(week)
+        inserted = week not in self._weeks
+        self._weeks[week] = list(rows)
+        if inserted:
+            self._weeks = dict(sorted(self._weeks.items()))
+
+    def drop_weeks(self, weeks):
+        """
+        Removes the rows for the given weeks.
+
+        Args:
+            weeks (list): The week numbers to remove.
+        """
+        for week in weeks:
+            self._weeks.pop(int(week), None)
+
+    def rows(self, week=None, weeks=None):
+        """
+        Gets the rows for one week, a set of weeks, or the whole season.
+
+        Args:
+            week (int): The week number to get rows for. If None, rows for `weeks` are returned.
+            weeks (list): The week numbers to get rows for. If None, every week is included.
+
+        Returns:
+            list: The matching rows in week order.
+        """
+        if week is not None:
+            return self._weeks.get(int(week), [])
+        if weeks is None:
+            return list(chain.from_iterable(self._weeks.values()))
+        return list(
+            chain.from_iterable(self._weeks[w] for w in weeks if w in self._weeks)
+        )
+
+    def weeks(self):
+        """
+        Gets the weeks held in the index.
+
+        Returns:
+            list: The week numbers in ascending order.
+        """
+        return list(self._weeks)
+
+    def items(self):
+        """
+        Gets each week with its rows.
+
+        Returns:
+            list: A list of (week, rows) tuples in week order.
+        """
+        return list(self._weeks.items())
+
+    def to_dict(self):
+        """
+        Returns the index as a plain dictionary of week number to rows.
+        """
+        return dict(self._weeks)
+
+    def __contains__(self, week):
+        return week in self._weeks
+
+    def __iter__(self):
+        return chain.from_iterable(self._weeks.values())
+
+    def __len__(self):
+        return sum(len(rows) for rows in self._weeks.values())
@@ -0,0 +1,76 @@
+"""
+Page Cache Module
+=================
+
+The Page Cache module provides the data loading and caching helpers shared by the Streamlit pages.
+
+Page results are cached in two layers, both keyed on the data generation from
+`LeagueGeneration`, so results are reused until a write changes the data. Functions wrapped
+with `page_cache` keep results within the process, bounded to `CACHE_ENTRIES` so entries of
+older generations are evicted. Their misses go through `shared_result`, which reads the result
+cache shared by every worker before computing.
+
+A page's independent queries are run concurrently by `gather`, each on its own async session,
+so the page waits for the slowest query rather than for all of them in turn.
+
+Functions:
+    page_cache: Caches a page function's results within the process.
+    shared_result: Gets a result from the shared result cache, computing it on a miss.
+    gather: Runs independent async queries concurrently and waits for all of them.
+"""
+
+import asyncio
+
+import streamlit as st
+
+from .database import run_async
+from .models.result_cache import get_result_cache
+
+CACHE_ENTRIES = 64
+
+
+def page_cache(func):
+    """
+    Caches a page function's results within the process.
+
+    The function should take the data generation as an argument, so new data is a cache miss.
+
+    Args:
+        func (callable): The page function.
+
+    Returns:
+        callable: The cached function.
+    """
+    return st.cache_data(max_entries=CACHE_ENTRIES)(func)
+
+
+def shared_result(key, generation, compute):
+    """
+    Gets a result from the result cache shared by every worker, computing it on a miss.
+
+    Args:
+        key (tuple): The key of the result, made of picklable primitives.
+        generation (int): The data generation the result is computed from.
+        compute (callable): A function that computes the result.
+
+    Returns:
+        The cached or freshly computed result.
+    """
+    return get_result_cache().get_or_set((*key, generation), compute)
+
+
+async def _gather(queries):
+    return await asyncio.gather(*queries)
+
+
+def gather(*queries):
+    """
+    Runs independent async queries concurrently on the shared database event loop.
+
+    Args:
+        *queries (coroutine): The queries to run. Each must open its own session.
+
+    Returns:
+        list: The results of the queries, in the order given.
+    """
+    return run_async(_gather(queries))
@@ -0,0 +1,45 @@
+"""
+Sync Module
+===========
+
+The Sync module is the entry point of the league sync job.
+
+Run it from the repository root on a schedule, such as nightly and after each week's games:
+
+    python -m backend.sync [--season SEASON] [--full]
+
+The league is set up if it is new, its stats are synced from Sleeper, and the leaderboard
+snapshots read by the Leaderboards page are refreshed.
+
+Functions:
+    main: Syncs a league from the command line.
+"""
+
+import argparse
+
+from .models.league import League
+
+
+def main(argv=None):
+    """
+    Syncs a league from the command line.
+
+    Args:
+        argv (list): The command line arguments. If None, `sys.argv` is used.
+    """
+    parser = argparse.ArgumentParser(description="Sync a league from Sleeper.")
+    parser.add_argument(
+        "--season", type=int, help="The season of the league (default: the active season)."
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Fetch every week instead of only new weeks."
+    )
+    args = parser.parse_args(argv)
+
+    league = League(season=args.season)
+    league.sync(incremental=not args.full)
+    print(f"League {league.league_id} synced through week {league.week}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,26 +2,37 @@ import streamlit as st
 import pandas as pd
 import importlib
 
-from backend.database import get_db
-from backend.models.pool import Pool
-from backend.models.league import League
-from backend.models.user import User
-
-db = next(get_db())
-
-@st.cache_data(ttl=3600)
-def get_pools():
-    pools = (
-        db.query(Pool)
-        .distinct(Pool.label, Pool.pool_type)
-        .filter(Pool.pool_subtype.in_(["season", "season_cumulative", "season_high"]))
-        .order_by(Pool.pool_type)
-        .all()
-    )
+from backend.models.generation import LeagueGeneration
+from backend.models.leaderboard import get_season_pools_async, get_users_async
+from backend.page_cache import gather, page_cache, shared_result
+
+
+def compute_page_data():
+    pools, users = gather(get_season_pools_async(), get_users_async())
+    return pools, [user.to_dict() for user in users]
+
+
+@page_cache
+def get_page_data(generation):
+    return shared_result(("leaderboards_page",), generation, compute_page_data)
+
+
+def get_pools(generation):
+    pools, _ = get_page_data(generation)
     return pools
 
-def get_leaderboard(_selected_pool):
-    leaderboard = _selected_pool.get_leaderboard()
+
+@page_cache
+def get_leaderboard_rows(_selected_pool, league_id, pool_id, generation):
+    return shared_result(
+        ("leaderboard", league_id, pool_id), generation, _selected_pool.get_leaderboard
+    )
+
+
+def get_leaderboard(_selected_pool, generation):
+    leaderboard = get_leaderboard_rows(
+        _selected_pool, _selected_pool.league_id, _selected_pool.pool_id, generation
+    )
     leaderboard_df = pd.DataFrame(leaderboard)
     # Add a rank column to the DataFrame
     leaderboard_df = leaderboard_df.reset_index(drop=True)  # Reset the index
@@ -32,7 +43,8 @@ def get_leaderboard(_selected_pool):
     except:
         pass
 
-    user_info_df = pd.DataFrame([user.to_dict() for user in db.query(User).all()])
+    _, users = get_page_data(generation)
+    user_info_df = pd.DataFrame(users)
 
     # Merge leaderboard DataFrame with user information DataFrame
     leaderboard_df = leaderboard_df.merge(
@@ -76,17 +88,15 @@ def get_leaderboard(_selected_pool):
 
 def main():
     st.header(f"Leaderboards")
-    pools = get_pools()
+    generation = LeagueGeneration.current()
+    pools = get_pools(generation)
     pool_labels = [pool.label for pool in pools]
     selected_pool_label = st.selectbox("Select a pool", pool_labels)
     selected_pool = next(
         (pool for pool in pools if pool.label == selected_pool_label), None
     )
-    selected_pool.league = (
-        db.query(League).filter(League.league_id == selected_pool.league_id).first()
-    )
     with st.spinner('Crunching numbers...'):
-        get_leaderboard(selected_pool)
+        get_leaderboard(selected_pool, generation)
 
 
 if __name__ == "__main__":
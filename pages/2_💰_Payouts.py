@@ -1,23 +1,30 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from sqlalchemy import func, distinct
 
-from backend.database import get_db
-from backend.models.payout import get_user_payouts, get_payout_details
-from backend.models.league import League
-from backend.models.pool import Pool
+from backend.models.generation import LeagueGeneration
+from backend.models.payout import get_payout_seasons_async, get_payouts_async
+from backend.page_cache import gather, page_cache, shared_result
 
-CACHE_TTL = 3600  # 1 hour
-db = next(get_db())
+ALL_TIME = "All Time"
 
-@st.cache_data(ttl=CACHE_TTL)
-def get_cached_user_payouts(season):
-    return get_user_payouts(season)
+
+@page_cache
+def get_cached_page_data(season, generation):
+    return shared_result(
+        ("payouts_page", season),
+        generation,
+        lambda: gather(get_payout_seasons_async(), get_payouts_async(season)),
+    )
+
+
+def get_cached_payouts(season, generation):
+    _, payouts = get_cached_page_data(season, generation)
+    return payouts
 
 
-def prepare_user_payouts_data(season):
-    payouts_data = get_cached_user_payouts(season)
+def prepare_user_payouts_data(season, generation):
+    payouts_data, _ = get_cached_payouts(season, generation)
     payouts_df = pd.DataFrame(payouts_data)
     payouts_df = payouts_df.sort_values(by="amount", ascending=False)
     return payouts_df
@@ -44,42 +51,35 @@ def create_user_payouts_chart(payouts_df, color_scheme, season=None):
     return chart
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def get_cached_payout_details(season):
-    return get_payout_details(season)
-
-
-def prepare_payout_details_data(season):
-    payouts_data = get_cached_payout_details(season)
+def prepare_payout_details_data(season, generation):
+    _, payouts_data = get_cached_payouts(season, generation)
     payouts_df = pd.DataFrame(payouts_data)
     payouts_df = st.dataframe(payouts_df, use_container_width=True, hide_index=True)
     return payouts_df
 
 
 def main():
-    seasons = db.query(League.season) \
-             .join(Pool, League.league_id == Pool.league_id, isouter=True) \
-             .filter(Pool.payout_amount != None) \
-             .group_by(League.season) \
-             .order_by(League.season.desc()) \
-             .all()    
-    seasons = [row.season for row in seasons]
-    seasons.insert(0, "All Time")
-    selected_season = st.selectbox("Select a season", seasons)
+    # The selection is known before the selectbox renders on reruns, so the seasons and the
+    # payouts of the selected season are loaded together.
+    generation = LeagueGeneration.current()
+    previous_season = st.session_state.get("payouts_season", ALL_TIME)
+    seasons, _ = get_cached_page_data(
+        None if previous_season == ALL_TIME else previous_season, generation
+    )
+    seasons = [ALL_TIME] + list(seasons)
+    selected_season = st.selectbox("Select a season", seasons, key="payouts_season")
     st.header(f"Payouts - {selected_season}")
 
-    if selected_season == "All Time":
+    if selected_season == ALL_TIME:
         selected_season = None
-    else:
-        selected_season
 
-    payouts_df = prepare_user_payouts_data(selected_season)
+    payouts_df = prepare_user_payouts_data(selected_season, generation)
     color_scheme = {
         "main": "#1c6866",
         "side": "#70afb8",
     }
     create_user_payouts_chart(payouts_df, color_scheme, selected_season)
-    prepare_payout_details_data(selected_season)
+    prepare_payout_details_data(selected_season, generation)
 
 
 if __name__ == "__main__":